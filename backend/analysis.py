@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+MAX_BATCH_SIZE = 10
+
+# The score breakdown is static, so it is served once from its own cacheable
+# resource and referenced from analysis responses instead of embedded in each
+BREAKDOWN_URL = '/api/chart-data'
+BREAKDOWN_MAX_AGE = 24 * 60 * 60
+
+UNIVERSE_QUERIES = ('top', 'bottom', 'movers')
+MAX_UNIVERSE_K = 500
+MAX_SEARCH_RESULTS = 50
+MAX_TREND_DAYS = 365
+
+
+def _isoformat(computed_at: Optional[float]) -> Optional[str]:
+    if computed_at is None:
+        return None
+    return datetime.fromtimestamp(computed_at, tz=timezone.utc).isoformat()
+
+
+def parse_tickers(data) -> Tuple[List[str], Optional[str]]:
+    """
+    The upper-cased 'tickers' list of a JSON request body (empty if absent).
+
+    Returns:
+        tickers (list): Upper-cased tickers
+        error (str): Error message for a 400 response, or None if valid
+    """
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return [], 'Request body must be a JSON object'
+    tickers = data.get('tickers', [])
+    if not isinstance(tickers, list) or not all(isinstance(ticker, str) for ticker in tickers):
+        return [], 'tickers must be a list of ticker strings'
+    return [ticker.upper() for ticker in tickers], None
+
+
+def parse_batch_tickers(data: Optional[dict]) -> Tuple[List[str], Optional[str]]:
+    """
+    Validate a batch-analysis request body.
+
+    Returns:
+        tickers (list): Upper-cased tickers to analyze
+        error (str): Error message for a 400 response, or None if valid
+    """
+    tickers, error = parse_tickers(data)
+    if error:
+        return [], error
+
+    if not tickers:
+        return [], 'No tickers provided'
+
+    # Limit batch size for performance
+    if len(tickers) > MAX_BATCH_SIZE:
+        return [], f'Maximum {MAX_BATCH_SIZE} tickers per batch'
+
+    return tickers, None
+
+
+def _bounded_int(args, name: str, default: int, upper: int) -> int:
+    """Integer query argument clamped to [1, upper]; the default if missing or not an integer"""
+    return min(max(args.get(name, default, type=int), 1), upper)
+
+
+def parse_universe_query(kind: str, args) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    Validate a universe query and its query string.
+
+    Returns:
+        k (int): Number of results, clamped to [1, MAX_UNIVERSE_K]
+        sector (str): Sector filter, or None for the whole universe
+        error (str): Error message for a 404 response, or None if valid
+    """
+    if kind not in UNIVERSE_QUERIES:
+        return 0, None, f'Unknown universe query: {kind}'
+    return _bounded_int(args, 'k', 10, MAX_UNIVERSE_K), args.get('sector'), None
+
+
+def parse_universe_tickers(data: Optional[dict]) -> Tuple[List[str], Optional[str]]:
+    """
+    Validate a universe-refresh request body.
+
+    Returns:
+        tickers (list): Upper-cased tickers to add to the universe (may be empty)
+        error (str): Error message for a 400 response, or None if valid
+    """
+    return parse_tickers(data)
+
+
+def parse_search_args(args) -> Tuple[str, int]:
+    """Search query and result limit, clamped to [1, MAX_SEARCH_RESULTS]"""
+    return args.get('q', ''), _bounded_int(args, 'limit', 10, MAX_SEARCH_RESULTS)
+
+
+def parse_trend_days(args) -> int:
+    """Days of sentiment trend, clamped to [1, MAX_TREND_DAYS]"""
+    return _bounded_int(args, 'days', 30, MAX_TREND_DAYS)
+
+
+def company_analysis_payload(ticker: str, credit_results: Dict[str, dict],
+                             computed_at: Optional[float] = None) -> Tuple[dict, int]:
+    """Build the single-company analysis response body and status code"""
+    if ticker not in credit_results:
+        return {
+            'error': f'No financial data available for {ticker}. Please check the ticker symbol.'
+        }, 404
+
+    return {
+        'ticker': ticker,
+        'credit_scores': credit_results[ticker],
+        'breakdown_url': BREAKDOWN_URL,
+        'success': True,
+        'timestamp': _isoformat(computed_at)
+    }, 200
+
+
+def batch_analysis_payload(tickers: List[str], credit_results: Dict[str, dict],
+                           computed_at: Optional[float] = None) -> dict:
+    """Build the batch-analysis response body"""
+    return {
+        'results': credit_results,
+        'breakdown_url': BREAKDOWN_URL,
+        'timestamp': _isoformat(computed_at),
+        'processed_count': len(credit_results),
+        'requested_count': len(tickers),
+        'success': True
+    }
@@ -1,8 +1,20 @@
 # app.py
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, render_template
 from flask_cors import CORS
-from fetch_and_score import fetch_and_compute_credit_scores, get_score_breakdown_data
+from fetch_and_score import get_score_breakdown_data
+from analysis import (parse_batch_tickers, parse_search_args, parse_trend_days, parse_universe_query,
+                      parse_universe_tickers, company_analysis_payload, batch_analysis_payload, BREAKDOWN_MAX_AGE)
+from cache import get_credit_scores, score_freshness
+from http_cache import json_response
+from whatif import what_if_payload
+from universe import universe_query_payload, universe_refresh_payload
+from ticker_directory import directory, load_default_directory
+from sentiment_series import sentiment_trend_payload
+from headline_dedup import headline_deduper
+from warmup import start_warmup, readiness_payload
+from dashboard import HISTORY_ORIENTS, dashboard_payload
 import logging
+import os
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
@@ -10,77 +22,14 @@ CORS(app)  # Enable CORS for React frontend
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@app.route('/api/company-analysis/<ticker>')
-def company_analysis(ticker):
-    """Get complete analysis for a specific company"""
-    try:
-        ticker = ticker.upper()
-        logger.info(f"Analyzing ticker: {ticker}")
-        
-        # Get credit scores for the ticker
-        credit_results = fetch_and_compute_credit_scores([ticker])
-        
-        if ticker not in credit_results:
-            return jsonify({
-                'error': f'No financial data available for {ticker}. Please check the ticker symbol.'
-            }), 404
-        
-        # Get breakdown data
-        breakdown_data = get_score_breakdown_data()
-        
-        response_data = {
-            'ticker': ticker,
-            'credit_scores': credit_results[ticker],
-            'breakdown': breakdown_data,
-            'success': True,
-            'timestamp': credit_results.get('timestamp', None)
-        }
-        
-        logger.info(f"Successfully analyzed {ticker}")
-        return jsonify(response_data)
-        
-    except Exception as e:
-        logger.error(f"Error analyzing {ticker}: {str(e)}")
-        return jsonify({
-            'error': f'Failed to analyze {ticker}: {str(e)}'
-        }), 500
-
-@app.route('/api/batch-analysis', methods=['POST'])
-def batch_analysis():
-    """Analyze multiple companies at once"""
-    try:
-        data = request.get_json()
-        tickers = data.get('tickers', [])
-        
-        if not tickers:
-            return jsonify({'error': 'No tickers provided'}), 400
-        
-        # Limit batch size for performance
-        if len(tickers) > 10:
-            return jsonify({'error': 'Maximum 10 tickers per batch'}), 400
-        
-        # Convert to uppercase
-        tickers = [ticker.upper() for ticker in tickers]
-        
-        # Get credit scores
-        credit_results = fetch_and_compute_credit_scores(tickers)
-        
-        # Get breakdown data
-        breakdown_data = get_score_breakdown_data()
-        
-        return jsonify({
-            'results': credit_results,
-            'breakdown': breakdown_data,
-            'processed_count': len(credit_results),
-            'requested_count': len(tickers),
-            'success': True
-        })
-    except Exception as e:
-        logger.error(f"Error in batch analysis: {str(e)}")
-        return jsonify({'error': 'Batch analysis failed'}), 500
+load_default_directory()
 
-app = Flask(__name__)
-logger = logging.getLogger(__name__)
+@app.before_request
+def ensure_warmup():
+    # Pre-compute the CREDTECH_WATCHLIST tickers in the background. Started here rather
+    # than at import because the debug reloader also imports this module in its
+    # file-watcher process, which never serves requests
+    start_warmup()
 
 @app.route('/')
 def dashboard():
@@ -92,7 +41,7 @@ def chart_data():
     """API endpoint to get pie chart data"""
     try:
         data = get_score_breakdown_data()
-        return jsonify(data)
+        return json_response(data, request.headers, max_age=BREAKDOWN_MAX_AGE)
     except Exception as e:
         logger.error(f"Error getting chart data: {str(e)}")
         return jsonify({'error': 'Failed to load chart data'}), 500
@@ -101,58 +50,128 @@ def chart_data():
 def company_analysis(ticker):
     """Get complete analysis for a specific company"""
     try:
-        # Get credit scores for the ticker
-        credit_results = fetch_and_compute_credit_scores([ticker.upper()])
-        
-        # Get breakdown data
-        breakdown_data = get_score_breakdown_data()
-        
-        if ticker.upper() not in credit_results:
-            return jsonify({'error': f'No data found for ticker {ticker}'}), 404
-        
-        return jsonify({
-            'ticker': ticker.upper(),
-            'credit_scores': credit_results[ticker.upper()],
-            'breakdown': breakdown_data,
-            'success': True
-        })
+        ticker = ticker.upper()
+        logger.info(f"Analyzing ticker: {ticker}")
+
+        # Get credit scores for the ticker (served from cache while fresh)
+        credit_results = get_credit_scores([ticker])
+        computed_at, max_age = score_freshness([ticker])
+        payload, status = company_analysis_payload(ticker, credit_results, computed_at)
+
+        if status != 200:
+            return jsonify(payload), status
+        logger.info(f"Successfully analyzed {ticker}")
+        return json_response(payload, request.headers, max_age=max_age, last_modified=computed_at)
+
     except Exception as e:
         logger.error(f"Error analyzing {ticker}: {str(e)}")
-        return jsonify({'error': f'Failed to analyze {ticker}'}), 500
+        return jsonify({
+            'error': f'Failed to analyze {ticker}: {str(e)}'
+        }), 500
 
 @app.route('/api/batch-analysis', methods=['POST'])
 def batch_analysis():
     """Analyze multiple companies at once"""
-    from flask import request
-    
     try:
-        data = request.get_json()
-        tickers = data.get('tickers', [])
-        
-        if not tickers:
-            return jsonify({'error': 'No tickers provided'}), 400
-        
-        # Limit batch size for performance
-        if len(tickers) > 10:
-            return jsonify({'error': 'Maximum 10 tickers per batch'}), 400
-        
+        tickers, error = parse_batch_tickers(request.get_json())
+        if error:
+            return jsonify({'error': error}), 400
+
         # Get credit scores
-        credit_results = fetch_and_compute_credit_scores(tickers)
-        
-        # Get breakdown data
-        breakdown_data = get_score_breakdown_data()
-        
-        return jsonify({
-            'results': credit_results,
-            'breakdown': breakdown_data,
-            'processed_count': len(credit_results),
-            'requested_count': len(tickers),
-            'success': True
-        })
+        credit_results = get_credit_scores(tickers)
+        computed_at, max_age = score_freshness(list(credit_results))
+
+        payload = batch_analysis_payload(tickers, credit_results, computed_at)
+        return json_response(payload, request.headers, max_age=max_age, method=request.method)
     except Exception as e:
         logger.error(f"Error in batch analysis: {str(e)}")
         return jsonify({'error': 'Batch analysis failed'}), 500
-        
+
+@app.route('/api/what-if', methods=['POST'])
+def what_if():
+    """Re-evaluate cached scores under alternative weights and normalization ranges"""
+    try:
+        payload, status = what_if_payload(request.get_json())
+        return jsonify(payload), status
+    except Exception as e:
+        logger.error(f"Error in what-if analysis: {str(e)}")
+        return jsonify({'error': 'What-if analysis failed'}), 500
+
+@app.route('/api/universe/<kind>')
+def universe_query(kind):
+    """Top-k, bottom-k or biggest movers across the scored universe"""
+    k, sector, error = parse_universe_query(kind, request.args)
+    if error:
+        return jsonify({'error': error}), 404
+    try:
+        return jsonify(universe_query_payload(kind, k, sector))
+    except Exception as e:
+        logger.error(f"Error in universe query: {str(e)}")
+        return jsonify({'error': 'Universe query failed'}), 500
+
+@app.route('/api/universe/refresh', methods=['POST'])
+def universe_refresh():
+    """Re-score the universe plus any new tickers and rebuild the ranking in the background"""
+    tickers, error = parse_universe_tickers(request.get_json(silent=True))
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        return jsonify(universe_refresh_payload(tickers)), 202
+    except Exception as e:
+        logger.error(f"Error refreshing universe: {str(e)}")
+        return jsonify({'error': 'Universe refresh failed'}), 500
+
+@app.route('/api/search')
+def search_companies():
+    """Typeahead search over the local ticker directory"""
+    query, limit = parse_search_args(request.args)
+    return jsonify({'query': query, 'results': directory.search(query, limit)})
+
+@app.route('/api/company-name/<ticker>')
+def company_name(ticker):
+    """Company name for a ticker from the local directory"""
+    name = directory.name(ticker)
+    if name is None:
+        return jsonify({'error': f'Unknown ticker {ticker.upper()}'}), 404
+    return jsonify({'ticker': ticker.upper(), 'name': name})
+
+@app.route('/api/sentiment/<ticker>/trend')
+def sentiment_trend(ticker):
+    """Daily and smoothed sentiment from stored headline scores (no new inference)"""
+    days = parse_trend_days(request.args)
+    payload, status = sentiment_trend_payload(ticker.upper(), days)
+    return jsonify(payload), status
+
+@app.route('/api/sentiment/stats')
+def sentiment_stats():
+    """Headline near-duplicate collapsing counters, including inference calls saved"""
+    return jsonify(headline_deduper.stats())
+
+@app.route('/api/ready')
+def readiness():
+    """Readiness gate: 503 with warm-up progress until the watchlist is cached"""
+    payload, status = readiness_payload()
+    return jsonify(payload), status
+
+@app.route('/api/dashboard/<ticker>')
+def company_dashboard(ticker):
+    """Score, band, breakdown, ratios and history for one company in a single response"""
+    ticker = ticker.upper()
+    orient = request.args.get('orient', 'records')
+    if orient not in HISTORY_ORIENTS:
+        return jsonify({'error': f"orient must be one of {', '.join(HISTORY_ORIENTS)}"}), 400
+    try:
+        payload, status = dashboard_payload(ticker, orient)
+        if status != 200:
+            return jsonify(payload), status
+        computed_at, max_age = score_freshness([ticker])
+        return json_response(payload, request.headers, max_age=max_age, last_modified=computed_at)
+    except Exception as e:
+        logger.error(f"Error building dashboard for {ticker}: {str(e)}")
+        return jsonify({'error': f'Failed to build dashboard for {ticker}: {str(e)}'}), 500
+
 if __name__ == '__main__':
+    # Only the reloader's serving child has WERKZEUG_RUN_MAIN set; warm there without waiting for a request
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_warmup()
     app.run(debug=True, host='0.0.0.0', port=5000)
-
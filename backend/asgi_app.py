@@ -0,0 +1,248 @@
+# asgi_app.py
+"""
+Asynchronous (ASGI) serving mode for the analysis API.
+
+Exposes the same routes as app.py on an event loop. yfinance and the news
+feed only offer blocking clients, so each ticker's fetch is handed to a worker
+thread and awaited; the event loop keeps accepting requests while upstream
+calls are in flight, and a batch fans its tickers out concurrently.
+
+Run with:  hypercorn asgi_app:app --bind 0.0.0.0:5001
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from quart import Quart, jsonify, request
+from quart_cors import cors
+
+from fetch_and_score import get_score_breakdown_data
+from analysis import (parse_batch_tickers, parse_search_args, parse_trend_days, parse_universe_query,
+                      parse_universe_tickers, company_analysis_payload, batch_analysis_payload, BREAKDOWN_MAX_AGE)
+from cache import get_credit_scores, score_cache, score_freshness
+from http_cache import json_response
+from whatif import what_if_payload
+from universe import universe_query_payload, universe_refresh_payload
+from ticker_directory import directory, load_default_directory
+from sentiment_series import sentiment_trend_payload
+from headline_dedup import headline_deduper
+from warmup import start_warmup, readiness_payload
+from dashboard import HISTORY_ORIENTS, dashboard_payload, is_cached
+
+app = cors(Quart(__name__))  # Enable CORS for React frontend
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+load_default_directory()
+
+# Upper bound on blocking upstream fetches running at once across all requests
+UPSTREAM_CONCURRENCY = int(os.environ.get("CREDTECH_UPSTREAM_CONCURRENCY", "32"))
+_upstream_slots = None
+# Uncached tickers being scored, so concurrent requests for one share a single fetch
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _slots() -> asyncio.Semaphore:
+    # Created lazily so the semaphore binds to the server's running loop
+    global _upstream_slots
+    if _upstream_slots is None:
+        _upstream_slots = asyncio.Semaphore(UPSTREAM_CONCURRENCY)
+    return _upstream_slots
+
+
+@app.before_serving
+async def size_thread_pool():
+    # asyncio.to_thread defaults to min(32, cpus + 4) threads, which would cap
+    # blocking fetches below UPSTREAM_CONCURRENCY on small hosts
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=UPSTREAM_CONCURRENCY))
+
+
+@app.before_serving
+async def begin_warmup():
+    # Pre-compute the CREDTECH_WATCHLIST tickers in the background, in the serving process only
+    start_warmup()
+
+
+async def _fetch_score(ticker: str) -> Dict[str, dict]:
+    async with _slots():
+        return await asyncio.to_thread(get_credit_scores, [ticker])
+
+
+def _score_future(ticker: str) -> asyncio.Future:
+    """The in-flight fetch for a ticker, started if there is none"""
+    future = _inflight.get(ticker)
+    if future is None:
+        future = asyncio.ensure_future(_fetch_score(ticker))
+        _inflight[ticker] = future
+        future.add_done_callback(lambda _: _inflight.pop(ticker, None))
+    return future
+
+
+async def score_tickers(tickers: List[str]) -> Dict[str, dict]:
+    """Score tickers concurrently without blocking the event loop"""
+    async def score_one(ticker):
+        entry = score_cache.get(ticker)
+        if entry is not None:
+            return {ticker: entry[0]}
+        # Shielded so a client that disconnects does not cancel the fetch other requests await
+        return await asyncio.shield(_score_future(ticker))
+
+    results = {}
+    for partial in await asyncio.gather(*(score_one(t) for t in tickers)):
+        results.update(partial)
+    return results
+
+
+@app.route('/api/chart-data')
+async def chart_data():
+    """API endpoint to get pie chart data"""
+    try:
+        data = get_score_breakdown_data()
+        return json_response(data, request.headers, max_age=BREAKDOWN_MAX_AGE)
+    except Exception as e:
+        logger.error(f"Error getting chart data: {str(e)}")
+        return jsonify({'error': 'Failed to load chart data'}), 500
+
+
+@app.route('/api/company-analysis/<ticker>')
+async def company_analysis(ticker):
+    """Get complete analysis for a specific company"""
+    try:
+        ticker = ticker.upper()
+        logger.info(f"Analyzing ticker: {ticker}")
+
+        credit_results = await score_tickers([ticker])
+        computed_at, max_age = score_freshness([ticker])
+        payload, status = company_analysis_payload(ticker, credit_results, computed_at)
+
+        if status != 200:
+            return jsonify(payload), status
+        logger.info(f"Successfully analyzed {ticker}")
+        return json_response(payload, request.headers, max_age=max_age, last_modified=computed_at)
+
+    except Exception as e:
+        logger.error(f"Error analyzing {ticker}: {str(e)}")
+        return jsonify({
+            'error': f'Failed to analyze {ticker}: {str(e)}'
+        }), 500
+
+
+@app.route('/api/batch-analysis', methods=['POST'])
+async def batch_analysis():
+    """Analyze multiple companies at once"""
+    try:
+        tickers, error = parse_batch_tickers(await request.get_json())
+        if error:
+            return jsonify({'error': error}), 400
+
+        credit_results = await score_tickers(tickers)
+        computed_at, max_age = score_freshness(list(credit_results))
+
+        payload = batch_analysis_payload(tickers, credit_results, computed_at)
+        return json_response(payload, request.headers, max_age=max_age, method=request.method)
+    except Exception as e:
+        logger.error(f"Error in batch analysis: {str(e)}")
+        return jsonify({'error': 'Batch analysis failed'}), 500
+
+
+@app.route('/api/what-if', methods=['POST'])
+async def what_if():
+    """Re-evaluate cached scores under alternative weights and normalization ranges"""
+    try:
+        payload, status = what_if_payload(await request.get_json())
+        return jsonify(payload), status
+    except Exception as e:
+        logger.error(f"Error in what-if analysis: {str(e)}")
+        return jsonify({'error': 'What-if analysis failed'}), 500
+
+
+@app.route('/api/universe/<kind>')
+async def universe_query(kind):
+    """Top-k, bottom-k or biggest movers across the scored universe"""
+    k, sector, error = parse_universe_query(kind, request.args)
+    if error:
+        return jsonify({'error': error}), 404
+    try:
+        return jsonify(universe_query_payload(kind, k, sector))
+    except Exception as e:
+        logger.error(f"Error in universe query: {str(e)}")
+        return jsonify({'error': 'Universe query failed'}), 500
+
+
+@app.route('/api/universe/refresh', methods=['POST'])
+async def universe_refresh():
+    """Re-score the universe plus any new tickers and rebuild the ranking in the background"""
+    tickers, error = parse_universe_tickers(await request.get_json(silent=True))
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        return jsonify(universe_refresh_payload(tickers)), 202
+    except Exception as e:
+        logger.error(f"Error refreshing universe: {str(e)}")
+        return jsonify({'error': 'Universe refresh failed'}), 500
+
+
+@app.route('/api/search')
+async def search_companies():
+    """Typeahead search over the local ticker directory"""
+    query, limit = parse_search_args(request.args)
+    return jsonify({'query': query, 'results': directory.search(query, limit)})
+
+
+@app.route('/api/company-name/<ticker>')
+async def company_name(ticker):
+    """Company name for a ticker from the local directory"""
+    name = directory.name(ticker)
+    if name is None:
+        return jsonify({'error': f'Unknown ticker {ticker.upper()}'}), 404
+    return jsonify({'ticker': ticker.upper(), 'name': name})
+
+
+@app.route('/api/sentiment/<ticker>/trend')
+async def sentiment_trend(ticker):
+    """Daily and smoothed sentiment from stored headline scores (no new inference)"""
+    days = parse_trend_days(request.args)
+    payload, status = sentiment_trend_payload(ticker.upper(), days)
+    return jsonify(payload), status
+
+
+@app.route('/api/sentiment/stats')
+async def sentiment_stats():
+    """Headline near-duplicate collapsing counters, including inference calls saved"""
+    return jsonify(headline_deduper.stats())
+
+
+@app.route('/api/ready')
+async def readiness():
+    """Readiness gate: 503 with warm-up progress until the watchlist is cached"""
+    payload, status = readiness_payload()
+    return jsonify(payload), status
+
+
+@app.route('/api/dashboard/<ticker>')
+async def company_dashboard(ticker):
+    """Score, band, breakdown, ratios and history for one company in a single response"""
+    ticker = ticker.upper()
+    orient = request.args.get('orient', 'records')
+    if orient not in HISTORY_ORIENTS:
+        return jsonify({'error': f"orient must be one of {', '.join(HISTORY_ORIENTS)}"}), 400
+    try:
+        if is_cached(ticker):
+            payload, status = dashboard_payload(ticker, orient)
+        else:
+            async with _slots():
+                payload, status = await asyncio.to_thread(dashboard_payload, ticker, orient)
+        if status != 200:
+            return jsonify(payload), status
+        computed_at, max_age = score_freshness([ticker])
+        return json_response(payload, request.headers, max_age=max_age, last_modified=computed_at)
+    except Exception as e:
+        logger.error(f"Error building dashboard for {ticker}: {str(e)}")
+        return jsonify({'error': f'Failed to build dashboard for {ticker}: {str(e)}'}), 500
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5001)
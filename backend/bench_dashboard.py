@@ -0,0 +1,108 @@
+"""
+Latency benchmark for /api/dashboard/<ticker> against dashboard.TARGET_P95_MS.
+
+By default the caches are seeded with synthetic scores, ratios, financial and
+sentiment history for --tickers companies and the Flask app is exercised
+in-process, so the number measured is payload assembly plus serialization
+with warm caches and no network. With --url the same requests go to a running
+server through load_test instead (warm it first, e.g. with CREDTECH_WATCHLIST).
+Exits non-zero if p95 latency misses the target.
+
+    python bench_dashboard.py --tickers 200 --requests 2000
+    python bench_dashboard.py --url http://localhost:5001 --ticker AAPL --concurrency 20
+"""
+import argparse
+import gzip
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from cache import RATIO_COLUMNS, history_cache, ratio_cache, store_credit_scores
+from dashboard import TARGET_P95_MS
+from sentiment_series import sentiment_book
+
+
+def seed_caches(n: int, score_runs: int = 50, headlines: int = 500, years: int = 4, seed: int = 0) -> List[str]:
+    """Fill every dashboard cache with synthetic data for n tickers; returns the tickers"""
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:04d}" for i in range(n)]
+    now = time.time()
+    for run in range(score_runs):
+        results = {}
+        for ticker in tickers:
+            altman, ohlson, sentiment = rng.uniform(-1, 8), rng.uniform(-4, 3), rng.uniform(0, 1)
+            base = float(rng.uniform(30, 80))
+            results[ticker] = {
+                'base_score': round(base, 2), 'score_min': round(base - 5, 2), 'score_max': round(base + 5, 2),
+                'altman_z': round(altman, 2), 'ohlson_o': round(ohlson, 2), 'sentiment': sentiment,
+                'estimated_fields': [], 'sector': 'Technology',
+                'components': {'altman_z': altman, 'ohlson_o': ohlson, 'sentiment': sentiment},
+            }
+        store_credit_scores(results)
+    for ticker in tickers:
+        ratio_cache.set(ticker, {name: f"{v:.6f}" for name, v in zip(RATIO_COLUMNS, rng.uniform(0, 3, len(RATIO_COLUMNS)))})
+        history_cache.set(ticker, [{'year': str(2025 - years + i), 'revenue': float(rng.uniform(1e9, 1e11)),
+                                    'net_income': float(rng.uniform(-1e9, 2e10))} for i in range(years)])
+        series, _ = sentiment_book.ensure(ticker)
+        series.add((now - rng.uniform(0, 90 * 86400), f"{ticker} headline {i}", float(rng.uniform(0, 1)))
+                   for i in range(headlines))
+    return tickers
+
+
+def bench_in_process(tickers: List[str], requests: int, orient: str) -> dict:
+    from app import app
+
+    client = app.test_client()
+    latencies, sizes, gzipped = [], [], []
+    for i in range(requests):
+        path = f"/api/dashboard/{tickers[i % len(tickers)]}?orient={orient}"
+        start = time.perf_counter()
+        resp = client.get(path)
+        latencies.append(time.perf_counter() - start)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        body = resp.get_data()
+        sizes.append(len(body))
+        if i < 50:
+            gzipped.append(len(gzip.compress(body)))
+    ms = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "max_ms": float(ms.max()),
+        "bytes": int(np.mean(sizes)),
+        "gzip_bytes": int(np.mean(gzipped)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100, help="Synthetic tickers to seed (in-process mode)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--ticker", default="AAPL", help="Ticker requested in --url mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight in --url mode")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if args.url:
+        from load_test import run_load
+        for orient in ("records", "columns"):
+            results[orient] = run_load(args.url, f"/api/dashboard/{args.ticker}?orient={orient}",
+                                       args.requests, args.concurrency)
+    else:
+        tickers = seed_caches(args.tickers)
+        for orient in ("records", "columns"):
+            results[orient] = bench_in_process(tickers, args.requests, orient)
+
+    print(f"{'orient':<10}" + "".join(f"{k:>14}" for k in results["records"]))
+    for orient, stats in results.items():
+        print(f"{orient:<10}" + "".join(f"{v:>14.2f}" if isinstance(v, float) else f"{v:>14}" for v in stats.values()))
+    worst = max(stats["p95_ms"] for stats in results.values())
+    print(f"\np95 {worst:.2f} ms vs target {TARGET_P95_MS} ms: {'OK' if worst <= TARGET_P95_MS else 'MISSED'}")
+    sys.exit(0 if worst <= TARGET_P95_MS else 1)
+
+
+if __name__ == "__main__":
+    main()
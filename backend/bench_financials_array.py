@@ -0,0 +1,107 @@
+"""
+Memory and throughput benchmark: FinancialsArray vs pydantic CompanyFinancials.
+
+Builds N synthetic issuer-quarters in each representation and reports the
+bytes allocated (tracemalloc), construction time and the time to compute
+Altman Z and Ohlson O for every record. The long DataFrame is sized with
+memory_usage(deep=True) instead: a deep copy shares the ticker string
+objects, so tracemalloc would count only their pointers.
+
+    python bench_financials_array.py --records 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from credtech import CompanyFinancials, altman_z_score, ohlson_o_score
+from financials_array import FIELDS, FinancialsArray
+
+
+def synthetic_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    total_assets = rng.uniform(1e7, 1e11, n)
+    current_assets = total_assets * rng.uniform(0.2, 0.6, n)
+    current_liabilities = total_assets * rng.uniform(0.1, 0.5, n)
+    df = pd.DataFrame({
+        'ticker': [f"T{i // 4:05d}" for i in range(n)],
+        'period': pd.Timestamp('2025-06-30') - pd.to_timedelta((np.arange(n) % 4) * 91, unit='D'),
+        'total_assets': total_assets,
+        'total_liabilities': total_assets * rng.uniform(0.2, 0.9, n),
+        'working_capital': current_assets - current_liabilities,
+        'retained_earnings': total_assets * rng.uniform(-0.2, 0.5, n),
+        'ebit': total_assets * rng.uniform(-0.05, 0.2, n),
+        'market_value_equity': total_assets * rng.uniform(0.3, 3.0, n),
+        'sales': total_assets * rng.uniform(0.1, 1.5, n),
+        'net_income': total_assets * rng.uniform(-0.05, 0.15, n),
+        'current_assets': current_assets,
+        'current_liabilities': current_liabilities,
+        'sentiment_score': rng.uniform(0, 1, n),
+    })
+    return df
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.records)
+    records = df[FIELDS].to_dict('records')
+    tickers = df['ticker'].tolist()
+    periods = df['period'].tolist()
+
+    models, model_bytes, model_build = measure(lambda: [CompanyFinancials(**r) for r in records])
+    arr, arr_bytes, arr_build = measure(lambda: FinancialsArray.from_dataframe(df))
+    _, append_bytes, append_build = measure(lambda: FinancialsArray.from_models(tickers, models, periods))
+    frame, _, frame_build = measure(lambda: df.copy(deep=True))
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+
+    start = time.perf_counter()
+    model_scores = [(altman_z_score(m), ohlson_o_score(m)) for m in models]
+    model_score = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cols = arr.as_namespace()
+    arr_altman, arr_ohlson = altman_z_score(cols), ohlson_o_score(cols)
+    arr_score = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row_scores = [altman_z_score(row) for row in arr]
+    row_score = time.perf_counter() - start
+
+    assert np.allclose(arr_altman, [a for a, _ in model_scores])
+    assert np.allclose(arr_ohlson, [o for _, o in model_scores])
+    assert np.allclose(row_scores, arr_altman)
+
+    n = args.records
+    print(f"{n} issuer-quarters\n")
+    print(f"{'representation':<34}{'memory':>12}{'bytes/row':>12}{'build':>10}")
+    for label, nbytes, build in (
+        ("list[CompanyFinancials]", model_bytes, model_build),
+        ("pandas DataFrame (long)", frame_bytes, frame_build),
+        ("FinancialsArray.from_dataframe", arr_bytes, arr_build),
+        ("FinancialsArray.from_models", append_bytes, append_build),
+    ):
+        print(f"{label:<34}{nbytes / 1e6:>10.1f}MB{nbytes / n:>12.0f}{build:>9.3f}s")
+
+    print("\nAltman Z + Ohlson O over all records")
+    print(f"  per-model loop       {model_score:.3f}s")
+    print(f"  FinancialsArray      {arr_score:.4f}s  ({model_score / arr_score:.0f}x)")
+    print(f"  row views (Altman)   {row_score:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
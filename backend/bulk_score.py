@@ -0,0 +1,231 @@
+"""
+Resumable bulk scorer: credit scores plus fetch_extra_ratios ratios for a
+ticker file, streamed to Parquet or CSV.
+
+    python bulk_score.py data/tickers.csv --output scores.parquet --workers 8
+    python bulk_score.py tickers.txt --output scores.csv --store data/statements --neutral-sentiment
+
+Tickers are scored in chunks on a thread pool and rows are flushed every
+--flush-rows results. The output doubles as the checkpoint: Parquet output is
+a directory of part files, each written to a temporary name and renamed into
+place, and CSV rows are appended and fsynced, so whatever is on disk is
+complete. A rerun with the same output skips every ticker already present
+and picks up where the last run stopped; with --retry-failed, tickers whose
+latest row is failed or partial are scored again and get a new row (the last
+row for a ticker is the current one). Failed rows carry the reason that
+ticker was skipped. On Ctrl-C queued chunks are cancelled, running chunks
+stop after their current ticker, and every row scored by then is flushed.
+"""
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cache import RATIO_COLUMNS, ratio_values
+from fetch_and_score import fetch_and_compute_credit_scores
+from fetch_extra_ratios import fetch_ratios_no_nans
+from ticker_directory import read_tickers
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = pa.schema(
+    [('ticker', pa.string()), ('status', pa.string()), ('error', pa.string())]
+    + [(name, pa.float64()) for name in ('base_score', 'score_min', 'score_max', 'altman_z', 'ohlson_o', 'sentiment')]
+    + [('sector', pa.string()), ('estimated_fields', pa.string())]
+    + [(name, pa.float64()) for name in RATIO_COLUMNS.values()]
+    + [('scored_at', pa.timestamp('s', tz='UTC'))]
+)
+_PART_RE = re.compile(r"part-(\d{6})\.parquet$")
+
+
+def _finished(statuses: Dict[str, str], retry_failed: bool) -> Set[str]:
+    """Tickers to skip given each ticker's latest row status"""
+    if not retry_failed:
+        return set(statuses)
+    return {ticker for ticker, status in statuses.items() if status == 'ok'}
+
+
+def score_chunk(tickers: List[str], store=None, sentiments: Optional[Dict[str, float]] = None,
+                stop: Optional[threading.Event] = None) -> List[dict]:
+    """
+    Score one chunk of tickers; every ticker gets a row, failed ones with status
+    'failed'. Once `stop` is set no further tickers are started, and tickers left
+    without a row are picked up by the next run.
+    """
+    if stop is not None and stop.is_set():
+        return []
+    now = pd.Timestamp.now(tz='UTC').floor('s')
+    errors: Dict[str, str] = {}
+    try:
+        results = fetch_and_compute_credit_scores(tickers, store=store, sentiments=sentiments, errors=errors)
+        chunk_error = 'Not scored'
+    except Exception as e:
+        results, chunk_error = {}, str(e)
+
+    rows = []
+    for ticker in tickers:
+        if stop is not None and stop.is_set():
+            break
+        row = {'ticker': ticker, 'scored_at': now}
+        score = results.get(ticker)
+        if score is None:
+            rows.append({**row, 'status': 'failed', 'error': errors.get(ticker, chunk_error)})
+            continue
+        row.update({key: score[key] for key in ('base_score', 'score_min', 'score_max', 'altman_z', 'ohlson_o', 'sentiment', 'sector')})
+        row['estimated_fields'] = ",".join(score['estimated_fields'])
+        try:
+            ratios = fetch_ratios_no_nans(ticker, store=store)
+            row.update(ratio_values(ratios))
+            row['status'] = 'ok'
+        except Exception as e:
+            logger.error(f"Ratios failed for {ticker}: {str(e)}")
+            row.update({'status': 'partial', 'error': f'Ratios failed: {str(e)}'})
+        rows.append(row)
+    return rows
+
+
+class ParquetSink:
+    """Directory of atomically written Parquet part files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _parts(self) -> List[int]:
+        return sorted(int(m.group(1)) for m in map(_PART_RE.match, os.listdir(self.path)) if m)
+
+    def done(self, retry_failed: bool = False) -> Set[str]:
+        statuses: Dict[str, str] = {}
+        for number in self._parts():
+            table = pq.read_table(os.path.join(self.path, f"part-{number:06d}.parquet"), columns=['ticker', 'status'])
+            statuses.update(zip(table['ticker'].to_pylist(), table['status'].to_pylist()))
+        return _finished(statuses, retry_failed)
+
+    def write(self, rows: List[dict]) -> None:
+        parts = self._parts()
+        path = os.path.join(self.path, f"part-{(parts[-1] + 1) if parts else 1:06d}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=SCHEMA), path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+
+class CsvSink:
+    """Single CSV file; appends are fsynced and a torn last line is dropped on resume."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def done(self, retry_failed: bool = False) -> Set[str]:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return set()
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+        if os.path.getsize(self.path) == 0:
+            return set()
+        df = pd.read_csv(self.path, usecols=['ticker', 'status'], dtype=str)
+        return _finished(dict(zip(df['ticker'], df['status'])), retry_failed)
+
+    def write(self, rows: List[dict]) -> None:
+        header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        df = pd.DataFrame(rows, columns=SCHEMA.names)
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            df.to_csv(f, header=header, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def run(tickers: List[str], sink, workers: int = 4, chunk_size: int = 25, flush_rows: int = 500,
+        store=None, neutral_sentiment: bool = False, retry_failed: bool = False) -> Dict[str, int]:
+    """Score tickers not yet in the sink (or not yet ok, with retry_failed); returns counts by row status"""
+    done = sink.done(retry_failed)
+    pending = [t for t in tickers if t not in done]
+    logger.info(f"{len(done)} tickers already in output, {len(pending)} to score")
+    counts: Dict[str, int] = {}
+    buffer: List[dict] = []
+    start, finished = time.time(), 0
+
+    def flush():
+        if buffer:
+            sink.write(buffer)
+            buffer.clear()
+
+    def collect(rows: List[dict]) -> None:
+        nonlocal finished
+        buffer.extend(rows)
+        for row in rows:
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+        finished += len(rows)
+
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures, collected = [], set()
+    try:
+        futures = [
+            executor.submit(score_chunk, chunk, store, {t: 0.5 for t in chunk} if neutral_sentiment else None, stop)
+            for chunk in _chunks(pending, chunk_size)
+        ]
+        for future in as_completed(futures):
+            collected.add(future)
+            collect(future.result())
+            if len(buffer) >= flush_rows:
+                flush()
+            elapsed = time.time() - start
+            logger.info(f"{finished}/{len(pending)} scored ({finished / elapsed:.1f} tickers/s)")
+    finally:
+        # Keep everything completed so far, even on Ctrl-C: queued chunks are cancelled,
+        # running ones return after their current ticker, and their rows are flushed too
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in futures:
+            if future not in collected and not future.cancelled() and future.exception() is None:
+                collect(future.result())
+        flush()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tickers", help="Ticker file (one per line, or delimited with a ticker/symbol column)")
+    parser.add_argument("--output", required=True, help="Parquet directory or .csv file; reused to resume")
+    parser.add_argument("--format", choices=("parquet", "csv"), help="Defaults from the output extension")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=25, help="Tickers per scoring call (score bands are vectorized per chunk)")
+    parser.add_argument("--flush-rows", type=int, default=500)
+    parser.add_argument("--store", help="StatementStore directory to read statements from instead of yfinance")
+    parser.add_argument("--neutral-sentiment", action="store_true", help="Skip news polling and use a neutral sentiment")
+    parser.add_argument("--retry-failed", action="store_true", help="Score again tickers whose last row is failed or partial")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, force=True)
+    # fetch_extra_ratios logs every line item at DEBUG
+    logging.getLogger("ratios").setLevel(logging.WARNING)
+
+    fmt = args.format or ('csv' if args.output.lower().endswith('.csv') else 'parquet')
+    sink = CsvSink(args.output) if fmt == 'csv' else ParquetSink(args.output)
+    store = None
+    if args.store:
+        from statement_store import StatementStore
+        store = StatementStore(args.store)
+
+    tickers = read_tickers(args.tickers)
+    counts = run(tickers, sink, workers=args.workers, chunk_size=args.chunk_size, flush_rows=args.flush_rows,
+                 store=store, neutral_sentiment=args.neutral_sentiment, retry_failed=args.retry_failed)
+    print(f"Scored {sum(counts.values())} tickers into {args.output}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
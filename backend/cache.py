@@ -0,0 +1,212 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yfinance as yf
+
+from fetch_and_score import fetch_and_compute_credit_scores
+
+logger = logging.getLogger(__name__)
+
+# How long a computed score is served before it is refetched (seconds)
+SCORE_TTL = int(os.environ.get("CREDTECH_SCORE_TTL", "900"))
+# Ratios come from statements that change quarterly, so they live longer
+RATIO_TTL = int(os.environ.get("CREDTECH_RATIO_TTL", "21600"))
+# Computed scores kept per ticker for the dashboard history
+SCORE_HISTORY_LENGTH = 500
+
+# fetch_extra_ratios display names -> numeric field names
+RATIO_COLUMNS = {
+    "Debt to Equity": "debt_to_equity",
+    "Price to Earnings": "price_to_earnings",
+    "Current Ratio": "current_ratio",
+    "Quick Ratio": "quick_ratio",
+    "ROCE": "roce",
+    "ROE": "roe",
+    "ROA": "roa",
+}
+# Annual income statement rows kept for the dashboard history
+HISTORY_ITEMS = {"Total Revenue": "revenue", "Net Income": "net_income"}
+
+
+class TTLCache:
+    """Thread-safe in-memory cache whose entries expire `ttl` seconds after they were computed."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, computed_at) for a fresh entry, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            return None
+        return entry
+
+    def set(self, key: str, value: Any, computed_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() if computed_at is None else computed_at)
+
+    def remaining(self, key: str) -> float:
+        """Seconds until the entry expires (0 if missing or already expired)."""
+        entry = self.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, self.ttl - (time.time() - entry[1]))
+
+    def items(self) -> List[Tuple[str, Any, float]]:
+        """All fresh entries as (key, value, computed_at)."""
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+        return [(key, value, at) for key, (value, at) in entries if now - at < self.ttl]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+score_cache = TTLCache(SCORE_TTL)
+ratio_cache = TTLCache(RATIO_TTL)
+history_cache = TTLCache(RATIO_TTL)
+# ticker -> (computed_at, base_score, score_min, score_max) for every score computed
+_score_history: Dict[str, deque] = {}
+# ticker -> raw (altman_z, ohlson_o, sentiment) of its latest score; kept after the score expires
+_latest_components: Dict[str, Tuple[float, float, float]] = {}
+_history_lock = threading.Lock()
+
+
+def store_credit_scores(results: Dict[str, dict]) -> None:
+    """Put freshly computed per-ticker results into the score cache"""
+    now = time.time()
+    for ticker, score in results.items():
+        score_cache.set(ticker, score, now)
+        with _history_lock:
+            history = _score_history.setdefault(ticker, deque(maxlen=SCORE_HISTORY_LENGTH))
+            history.append((now, score['base_score'], score.get('score_min'), score.get('score_max')))
+            if 'components' in score:
+                c = score['components']
+                _latest_components[ticker] = (c['altman_z'], c['ohlson_o'], c['sentiment'])
+
+
+def get_score_history(ticker: str) -> List[Tuple[float, float, Optional[float], Optional[float]]]:
+    """Scores computed for a ticker in this process, oldest first, as (computed_at, score, min, max)"""
+    with _history_lock:
+        return list(_score_history.get(ticker, ()))
+
+
+def get_credit_scores(tickers: List[str]) -> Dict[str, dict]:
+    """Return credit scores for tickers, fetching only those missing or expired in the cache"""
+    results = {}
+    missing = []
+    for ticker in tickers:
+        entry = score_cache.get(ticker)
+        if entry is None:
+            missing.append(ticker)
+        else:
+            results[ticker] = entry[0]
+
+    if missing:
+        logger.info(f"Score cache miss for {missing}")
+        fresh = fetch_and_compute_credit_scores(missing)
+        store_credit_scores(fresh)
+        results.update(fresh)
+    return results
+
+
+def refresh_credit_scores(tickers: List[str]) -> Dict[str, dict]:
+    """Recompute credit scores for tickers whether or not they are cached"""
+    fresh = fetch_and_compute_credit_scores(tickers)
+    store_credit_scores(fresh)
+    return fresh
+
+
+def get_ratios(ticker: str, refresh: bool = False) -> Dict[str, str]:
+    """Financial ratios for a ticker, served from the ratio cache while fresh"""
+    entry = None if refresh else ratio_cache.get(ticker)
+    if entry is not None:
+        return entry[0]
+    # Imported here: fetch_extra_ratios configures DEBUG logging on import
+    from fetch_extra_ratios import fetch_ratios_no_nans
+    ratios = fetch_ratios_no_nans(ticker)
+    ratio_cache.set(ticker, ratios)
+    return ratios
+
+
+def ratio_values(ratios: Dict[str, str]) -> Dict[str, Optional[float]]:
+    """fetch_extra_ratios strings as numbers keyed by RATIO_COLUMNS names (None for N/A)"""
+    values = {}
+    for name, column in RATIO_COLUMNS.items():
+        try:
+            values[column] = float(ratios.get(name))
+        except (TypeError, ValueError):
+            values[column] = None
+    return values
+
+
+def get_financial_history(ticker: str, refresh: bool = False) -> List[dict]:
+    """Annual revenue and net income for a ticker, oldest year first, served from the history cache"""
+    entry = None if refresh else history_cache.get(ticker)
+    if entry is not None:
+        return entry[0]
+    annual = yf.Ticker(ticker).financials
+    history = []
+    if annual is not None and not annual.empty:
+        for period in sorted(annual.columns):
+            row = {'year': str(getattr(period, 'year', period))}
+            for item, key in HISTORY_ITEMS.items():
+                value = float(annual.at[item, period]) if item in annual.index else np.nan
+                row[key] = value if np.isfinite(value) else None
+            history.append(row)
+    history_cache.set(ticker, history)
+    return history
+
+
+def score_freshness(tickers: List[str]) -> Tuple[Optional[float], int]:
+    """
+    Freshness of the cached scores for tickers.
+
+    Returns:
+        computed_at (float): Epoch time of the oldest score, or None if none are cached
+        max_age (int): Whole seconds until the first of them expires
+    """
+    computed = [score_cache.get(t) for t in tickers]
+    computed = [entry[1] for entry in computed if entry is not None]
+    if not computed:
+        return None, 0
+    return min(computed), int(min(score_cache.remaining(t) for t in tickers))
+
+
+def cached_components(tickers: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray, List[str]]:
+    """
+    Raw score components from the latest score computed for each ticker in
+    this process, without fetching anything. Unlike the score cache these do
+    not expire, so every ticker scored so far stays available.
+
+    Returns:
+        found (list): Tickers with stored components, in row order
+        components (ndarray): (len(found), 3) array of Altman Z, Ohlson O, sentiment
+        missing (list): Requested tickers that have never been scored
+    """
+    with _history_lock:
+        latest = dict(_latest_components)
+    if tickers is None:
+        tickers = list(latest)
+
+    found, rows, missing = [], [], []
+    for ticker in tickers:
+        if ticker not in latest:
+            missing.append(ticker)
+            continue
+        found.append(ticker)
+        rows.append(latest[ticker])
+    return found, np.array(rows, dtype=float).reshape(-1, 3), missing
@@ -1,4 +1,5 @@
 from typing import Tuple
+import numpy as np
 from pydantic import BaseModel, Field
 
 class CompanyFinancials(BaseModel):
@@ -38,7 +39,7 @@ def ohlson_o_score(fin: CompanyFinancials) -> float:
     """
     size = fin.total_liabilities / fin.total_assets
     leverage = fin.current_liabilities / fin.current_assets
-    net_income_sign = 1 if fin.net_income < 0 else 0
+    net_income_sign = (fin.net_income < 0) * 1  # elementwise for NumPy inputs
     wc_over_assets = fin.working_capital / fin.total_assets
 
     # Simplified formula (not all 9 terms included here)
@@ -58,6 +59,12 @@ def normalize_score(score: float, min_val: float, max_val: float) -> float:
     return max(0, min(100, 100 * (score - min_val) / (max_val - min_val)))
 
 
+def normalize_scores(scores: np.ndarray, min_val: float, max_val: float) -> np.ndarray:
+    """Vectorized normalize_score for an array of raw scores."""
+    scores = np.asarray(scores)
+    return np.clip(100 * (scores - min_val) / (max_val - min_val), 0, 100)
+
+
 def combined_credit_score(
     fin: CompanyFinancials,
     weight_altman: float = 0.5,
@@ -70,8 +77,9 @@ def combined_credit_score(
 
     Returns:
         final_score (float): Credit score out of 100
-        confidence_interval (tuple): Score range (low, high) showing error margin
+        confidence_interval (tuple): 5th-95th percentile score range under input uncertainty
     """
+    from uncertainty import score_bands
 
     # Step 1: Compute raw Altman Z and Ohlson O scores
     altman = altman_z_score(fin)
@@ -90,9 +98,14 @@ def combined_credit_score(
         + weight_sentiment * sentiment_norm
     )
 
-    # Step 4: Error margins (±5% of score to reflect uncertainty)
-    margin = final_score * 0.05
-    return final_score, (final_score - margin, final_score + margin)
+    # Step 4: Error margins from Monte Carlo draws of the inputs
+    low, high = score_bands(
+        [fin],
+        weights=(weight_altman, weight_ohlson, weight_sentiment),
+        altman_range=(-5, 8),
+        ohlson_range=(-3, 3),
+    )
+    return final_score, (float(low[0]), float(high[0]))
 
 
 # ================== Example Usage =====================
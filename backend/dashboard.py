@@ -0,0 +1,127 @@
+"""
+Aggregated dashboard payload: score, band, breakdown, ratios and history for
+one ticker in a single response.
+
+Everything is read from the caches (score, ratio and financial history TTL
+caches and the rolling sentiment series); only entries missing from them are
+fetched. History series are compact: epoch-second timestamps, rounded numbers,
+and either a list of short-keyed records (orient=records) or one array per
+field (orient=columns), which is smaller still and maps straight onto chart
+series. If ratios or financial history cannot be fetched, that section is
+null (ratios) or empty (financial history) and the rest is still served; the
+failure is remembered for CREDTECH_FAILURE_TTL seconds so repeated requests
+for that ticker do not go back upstream each time.
+"""
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analysis import _isoformat
+from cache import (TTLCache, get_credit_scores, get_financial_history, get_ratios, get_score_history,
+                   history_cache, ratio_cache, ratio_values, score_cache, score_freshness)
+from credtech import normalize_score
+from fetch_and_score import ALTMAN_RANGE, OHLSON_RANGE, get_score_breakdown_data
+from sentiment_series import sentiment_book
+from ticker_directory import directory
+
+logger = logging.getLogger(__name__)
+
+HISTORY_ORIENTS = ('records', 'columns')
+SENTIMENT_HISTORY_DAYS = 90
+# Latency budget for a dashboard served from warm caches (see bench_dashboard.py)
+TARGET_P95_MS = 50
+DIGITS = 4
+# How long a failed ratio or history fetch is served as missing before it is retried (seconds)
+FAILURE_TTL = int(os.environ.get("CREDTECH_FAILURE_TTL", "300"))
+
+# ticker -> error message of its last failed fetch
+ratio_failures = TTLCache(FAILURE_TTL)
+history_failures = TTLCache(FAILURE_TTL)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), DIGITS)
+
+
+def _series(fields: Sequence[str], rows: List[Sequence], orient: str):
+    """Rows of values as short-keyed records or as one list per field"""
+    if orient == 'columns':
+        return {field: [row[i] for row in rows] for i, field in enumerate(fields)}
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def is_cached(ticker: str) -> bool:
+    """Whether every part of the dashboard can be served without an upstream fetch"""
+    return (ticker in score_cache
+            and (ticker in ratio_cache or ticker in ratio_failures)
+            and (ticker in history_cache or ticker in history_failures))
+
+
+def score_contributions(components: Dict[str, float]) -> Dict[str, float]:
+    """Points each component adds to the base score (weights from get_score_breakdown_data)"""
+    weights = get_score_breakdown_data()['weights']
+    return {
+        'altman': _round(weights['altman_weight'] / 100 * normalize_score(components['altman_z'], *ALTMAN_RANGE)),
+        'ohlson': _round(weights['ohlson_weight'] / 100 * normalize_score(components['ohlson_o'], *OHLSON_RANGE)),
+        'sentiment': _round(weights['sentiment_weight'] * components['sentiment']),
+    }
+
+
+def _ratios(ticker: str) -> Optional[Dict[str, Optional[float]]]:
+    if ticker not in ratio_cache and ticker in ratio_failures:
+        return None
+    try:
+        return {key: _round(value) for key, value in ratio_values(get_ratios(ticker)).items()}
+    except Exception as e:
+        logger.error(f"Dashboard ratios unavailable for {ticker}: {str(e)}")
+        ratio_failures.set(ticker, str(e))
+        return None
+
+
+def _financial_rows(ticker: str) -> List[Tuple]:
+    if ticker not in history_cache and ticker in history_failures:
+        return []
+    try:
+        return [(row['year'], row['revenue'], row['net_income']) for row in get_financial_history(ticker)]
+    except Exception as e:
+        logger.error(f"Dashboard financial history unavailable for {ticker}: {str(e)}")
+        history_failures.set(ticker, str(e))
+        return []
+
+
+def dashboard_payload(ticker: str, orient: str = 'records') -> Tuple[dict, int]:
+    """Build the dashboard response body and status code for one ticker"""
+    score = get_credit_scores([ticker]).get(ticker)
+    if score is None:
+        return {
+            'error': f'No financial data available for {ticker}. Please check the ticker symbol.'
+        }, 404
+
+    components = score['components']
+    computed_at, _ = score_freshness([ticker])
+
+    score_rows = [(int(at), _round(base), _round(lo), _round(hi)) for at, base, lo, hi in get_score_history(ticker)]
+    series = sentiment_book.series(ticker)
+    sentiment_rows = [(day['date'], day['mean'], day['count'])
+                      for day in (series.trend(SENTIMENT_HISTORY_DAYS) if series else [])]
+    financial_rows = _financial_rows(ticker)
+
+    return {
+        'ticker': ticker,
+        'name': directory.name(ticker),
+        'sector': score.get('sector'),
+        'score': score['base_score'],
+        'band': [score.get('score_min'), score.get('score_max')],
+        'components': {key: _round(value) for key, value in components.items()},
+        'estimated_fields': score.get('estimated_fields', []),
+        'breakdown': {'contributions': score_contributions(components), **get_score_breakdown_data()},
+        'ratios': _ratios(ticker),
+        'history': {
+            'orient': orient,
+            'scores': _series(('t', 'score', 'min', 'max'), score_rows, orient),
+            'sentiment': _series(('date', 'mean', 'count'), sentiment_rows, orient),
+            'financials': _series(('year', 'revenue', 'net_income'), financial_rows, orient),
+        },
+        'success': True,
+        'timestamp': _isoformat(computed_at)
+    }, 200
@@ -1,163 +1,226 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
+from datetime import datetime
 from credtech import altman_z_score, ohlson_o_score, normalize_score, CompanyFinancials
-from unstructured import news_sentiment_score
+from sentiment_series import update_sentiment
+from uncertainty import score_bands
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Normalization ranges for the raw Altman Z and Ohlson O scores
+ALTMAN_RANGE = (-3, 10)
+OHLSON_RANGE = (-5, 4)
+# Production (altman, ohlson, sentiment) weights of the final score
+SCORE_WEIGHTS = (0.50, 0.40, 0.10)
+
+# Statement line items extract_financials reads for each input, in order of preference
+BALANCE_SHEET_KEYS = {
+    'total_assets': ['Total Assets', 'TotalAssets', 'Assets'],
+    'total_liabilities': ['Total Liabilities Net Minority Interest', 'Total Liab', 'Total Liabilities', 'TotalLiabilities'],
+    'total_equity': ['Total Equity Gross Minority Interest', 'Total Stockholder Equity', 'Stockholders Equity',
+                     'Total Equity', 'Shareholders Equity'],
+    'current_assets': ['Total Current Assets', 'TotalCurrentAssets', 'Current Assets'],
+    'current_liabilities': ['Total Current Liabilities', 'TotalCurrentLiabilities', 'Current Liabilities'],
+    'retained_earnings': ['Retained Earnings', 'RetainedEarnings'],
+}
+INCOME_KEYS = {
+    'revenue': ['Total Revenue', 'TotalRevenue', 'Revenue', 'Net Sales'],
+    'net_income': ['Net Income', 'NetIncome'],
+    'ebit': ['EBIT', 'Ebit', 'Operating Income', 'OperatingIncome'],
+}
+# Info fields read by extract_financials and fetch_and_compute_credit_scores
+INFO_KEYS = ['marketCap', 'sector']
+
+def extract_financials(ticker: str, bs_latest, is_latest, info: dict):
+    """
+    Pull the CompanyFinancials inputs (all but sentiment) out of the latest
+    quarterly balance sheet and income statement (Series or dicts keyed by
+    line item), filling gaps with the usual fallbacks.
+
+    Returns:
+        fields (dict): CompanyFinancials keyword arguments without sentiment_score
+        estimated (set): Names of fields that came from a fallback rather than a reported value
+    """
+    estimated = set()
+
+    def safe_extract(series, keys, default=np.nan):
+        for key in keys:
+            try:
+                value = series.get(key)
+                if value is not None and not pd.isna(value):
+                    return float(value)
+            except:
+                continue
+        return default
+
+    total_assets = safe_extract(bs_latest, BALANCE_SHEET_KEYS['total_assets'])
+    # Try to get total liabilities. If missing, compute as: assets - total equity
+    total_liabilities = safe_extract(bs_latest, BALANCE_SHEET_KEYS['total_liabilities'])
+    if pd.isna(total_liabilities):
+        total_equity = safe_extract(bs_latest, BALANCE_SHEET_KEYS['total_equity'])
+        if not pd.isna(total_equity) and not pd.isna(total_assets):
+            # Balance sheet identity, not an estimate
+            total_liabilities = total_assets - total_equity
+            logger.info(f"{ticker}: Derived total_liabilities as total_assets - total_equity")
+        else:
+            estimated.add('total_liabilities')
+            total_liabilities = 100000  # Absolute fallback
+
+    current_assets = safe_extract(bs_latest, BALANCE_SHEET_KEYS['current_assets'])
+    current_liabilities = safe_extract(bs_latest, BALANCE_SHEET_KEYS['current_liabilities'])
+    retained_earnings = safe_extract(bs_latest, BALANCE_SHEET_KEYS['retained_earnings'])
+    revenue = safe_extract(is_latest, INCOME_KEYS['revenue'])
+    net_income = safe_extract(is_latest, INCOME_KEYS['net_income'])
+    ebit = safe_extract(is_latest, INCOME_KEYS['ebit'])
+    market_cap = info.get('marketCap')
+
+    if pd.isna(retained_earnings) and not (pd.isna(total_assets) or pd.isna(total_liabilities)):
+        retained_earnings = total_assets - total_liabilities
+        estimated.add('retained_earnings')
+        logger.info(f"{ticker}: Estimated retained_earnings from equity")
+    if pd.isna(ebit) and not pd.isna(net_income):
+        ebit = net_income
+        estimated.add('ebit')
+        logger.info(f"{ticker}: Used net_income as EBIT proxy")
+    if pd.isna(current_assets) and not pd.isna(total_assets):
+        current_assets = total_assets * 0.40
+        estimated.add('current_assets')
+        logger.info(f"{ticker}: Estimated current_assets as 40% of total_assets")
+    if pd.isna(current_liabilities) and not pd.isna(total_liabilities):
+        current_liabilities = total_liabilities * 0.60
+        estimated.add('current_liabilities')
+        logger.info(f"{ticker}: Estimated current_liabilities as 60% of total_liabilities")
+
+    if not pd.isna(current_assets) and not pd.isna(current_liabilities):
+        working_capital = current_assets - current_liabilities
+    else:
+        working_capital = 0.0
+        estimated.add('working_capital')
+        logger.warning(f"{ticker}: Working capital set to 0 due to missing current asset/liability data")
+    def apply_default(value, default, field_name):
+        if pd.isna(value) or value is None:
+            logger.warning(f"{ticker}: Using default for {field_name}: {default}")
+            estimated.add(field_name)
+            return default
+        return float(value)
+
+    fields = dict(
+        total_assets=max(apply_default(total_assets, 1000000, "total_assets"), 1000000),
+        total_liabilities=max(apply_default(total_liabilities, 100000, "total_liabilities"), 100000),
+        working_capital=working_capital,
+        retained_earnings=apply_default(retained_earnings, 0, "retained_earnings"),
+        ebit=apply_default(ebit, 0, "ebit"),
+        market_value_equity=max(apply_default(market_cap, 1000000, "market_value_equity"), 1000000),
+        sales=max(apply_default(revenue, 0, "sales"), 0),
+        net_income=apply_default(net_income, 0, "net_income"),
+        current_assets=max(apply_default(current_assets, 0, "current_assets"), 0),
+        current_liabilities=max(apply_default(current_liabilities, 0, "current_liabilities"), 0),
+    )
+    return fields, estimated
+
 def fetch_and_compute_credit_scores(
     tickers: List[str], 
-    weight_altman: float = 0.50,
-    weight_ohlson: float = 0.40,
-    weight_sentiment: float = 0.10
+    weight_altman: float = SCORE_WEIGHTS[0],
+    weight_ohlson: float = SCORE_WEIGHTS[1],
+    weight_sentiment: float = SCORE_WEIGHTS[2],
+    store=None,
+    sentiments: Optional[Dict[str, float]] = None,
+    errors: Optional[Dict[str, str]] = None
 ) -> Dict[str, Dict[str, float]]:
+    """
+    Score tickers from their latest quarterly statements and news sentiment.
+
+    Sentiment is the ticker's time-decayed rolling value (see sentiment_series);
+    only headlines not seen on earlier polls go through the news model.
+    If a StatementStore is given, tickers it holds are read from disk instead
+    of yfinance. Sentiment scores found in `sentiments` are used as-is instead
+    of polling the news feed. If an `errors` dict is given, the reason each
+    failed ticker was skipped is recorded in it.
+    """
     results = {}
     failed_tickers = []
+    # Per-ticker inputs for the Monte Carlo score bands, run in one pass after the loop
+    band_inputs = []
     for ticker in tickers:
         logger.info(f"Processing ticker: {ticker}")
         try:
-            stock = yf.Ticker(ticker)
-            quarterly_bs = stock.quarterly_balance_sheet
-            quarterly_income = stock.quarterly_financials
-            info = stock.info
+            if store is not None and ticker in store:
+                bs_latest, is_latest, info = store.latest_quarter(ticker)
+            else:
+                stock = yf.Ticker(ticker)
+                quarterly_bs = stock.quarterly_balance_sheet
+                quarterly_income = stock.quarterly_financials
+                info = stock.info
+                bs_latest = quarterly_bs.iloc[:, 0] if not quarterly_bs.empty else {}
+                is_latest = quarterly_income.iloc[:, 0] if not quarterly_income.empty else {}
 
-            if quarterly_bs.empty or quarterly_income.empty:
+            if len(bs_latest) == 0 or len(is_latest) == 0:
                 logger.warning(f"No financial data available for {ticker}")
                 failed_tickers.append(ticker)
+                if errors is not None:
+                    errors[ticker] = 'No financial data available'
                 continue
 
-            bs_latest = quarterly_bs.iloc[:, 0]
-            is_latest = quarterly_income.iloc[:, 0]
-
-            def safe_extract(series, keys, default=np.nan):
-                for key in keys:
-                    try:
-                        value = series.get(key)
-                        if value is not None and not pd.isna(value):
-                            return float(value)
-                    except:
-                        continue
-                return default
-
-            total_assets = safe_extract(bs_latest, [
-                'Total Assets', 'TotalAssets', 'Assets'
-            ])
-            # Try to get total liabilities. If missing, compute as: assets - total equity
-            total_liabilities = safe_extract(bs_latest, [
-                'Total Liab', 'Total Liabilities', 'TotalLiabilities'
-            ])
-            if pd.isna(total_liabilities):
-                total_equity = safe_extract(bs_latest, [
-                    'Total Stockholder Equity', 'Stockholders Equity', 'Total Equity', 'Shareholders Equity'
-                ])
-                if not pd.isna(total_equity) and not pd.isna(total_assets):
-                    total_liabilities = total_assets - total_equity
-                    logger.info(f"{ticker}: Estimated total_liabilities as total_assets - total_equity")
-                else:
-                    total_liabilities = 100000  # Absolute fallback
-
-            current_assets = safe_extract(bs_latest, [
-                'Total Current Assets', 'TotalCurrentAssets', 'Current Assets'
-            ])
-            current_liabilities = safe_extract(bs_latest, [
-                'Total Current Liabilities', 'TotalCurrentLiabilities', 'Current Liabilities'
-            ])
-            retained_earnings = safe_extract(bs_latest, [
-                'Retained Earnings', 'RetainedEarnings'
-            ])
-            revenue = safe_extract(is_latest, [
-                'Total Revenue', 'TotalRevenue', 'Revenue', 'Net Sales'
-            ])
-            net_income = safe_extract(is_latest, [
-                'Net Income', 'NetIncome'
-            ])
-            ebit = safe_extract(is_latest, [
-                'EBIT', 'Ebit', 'Operating Income', 'OperatingIncome'
-            ])
-            market_cap = info.get('marketCap')
-
-            if pd.isna(retained_earnings) and not (pd.isna(total_assets) or pd.isna(total_liabilities)):
-                retained_earnings = total_assets - total_liabilities
-                logger.info(f"{ticker}: Estimated retained_earnings from equity")
-            if pd.isna(ebit) and not pd.isna(net_income):
-                ebit = net_income
-                logger.info(f"{ticker}: Used net_income as EBIT proxy")
-            if pd.isna(current_assets) and not pd.isna(total_assets):
-                current_assets = total_assets * 0.40
-                logger.info(f"{ticker}: Estimated current_assets as 40% of total_assets")
-            if pd.isna(current_liabilities) and not pd.isna(total_liabilities):
-                current_liabilities = total_liabilities * 0.60
-                logger.info(f"{ticker}: Estimated current_liabilities as 60% of total_liabilities")
-            
-            if not pd.isna(current_assets) and not pd.isna(current_liabilities):
-                working_capital = current_assets - current_liabilities
+            fields, estimated = extract_financials(ticker, bs_latest, is_latest, info)
+            # Smoothed sentiment; the effective headline count drives its band
+            if sentiments is not None and ticker in sentiments:
+                sentiment_score, headline_count, headline_std = sentiments[ticker], 0, 0.0
             else:
-                working_capital = 0.0
-                logger.warning(f"{ticker}: Working capital set to 0 due to missing current asset/liability data")
-            def apply_default(value, default, field_name):
-                if pd.isna(value) or value is None:
-                    logger.warning(f"{ticker}: Using default for {field_name}: {default}")
-                    return default
-                return float(value)
-            
-            total_assets = max(apply_default(total_assets, 1000000, "total_assets"), 1000000)
-            total_liabilities = max(apply_default(total_liabilities, 100000, "total_liabilities"), 100000)
-            current_assets = max(apply_default(current_assets, 0, "current_assets"), 0)
-            current_liabilities = max(apply_default(current_liabilities, 0, "current_liabilities"), 0)
-            retained_earnings = apply_default(retained_earnings, 0, "retained_earnings")
-            ebit = apply_default(ebit, 0, "ebit")
-            market_cap = max(apply_default(market_cap, 1000000, "market_cap"), 1000000)
-            revenue = max(apply_default(revenue, 0, "revenue"), 0)
-            net_income = apply_default(net_income, 0, "net_income")
-            # Get sentiment score
-            sentiment_score = news_sentiment_score(ticker)
-
-            fin = CompanyFinancials(
-                total_assets=total_assets,
-                total_liabilities=total_liabilities,
-                working_capital=working_capital,
-                retained_earnings=retained_earnings,
-                ebit=ebit,
-                market_value_equity=market_cap,
-                sales=revenue,
-                net_income=net_income,
-                current_assets=current_assets,
-                current_liabilities=current_liabilities,
-                sentiment_score=sentiment_score
-            )
+                sentiment_score, headline_count, headline_std = update_sentiment(ticker)
+
+            fin = CompanyFinancials(**fields, sentiment_score=sentiment_score)
+
+            altman = altman_z_score(fin)
+            ohlson = ohlson_o_score(fin)
 
             # Use wide normalization ranges to ensure healthy company scores map high, e.g.: 
-            altman_norm = normalize_score(altman_z_score(fin), -3, 10)
-            ohlson_norm = normalize_score(ohlson_o_score(fin), -5, 4)
+            altman_norm = normalize_score(altman, *ALTMAN_RANGE)
+            ohlson_norm = normalize_score(ohlson, *OHLSON_RANGE)
 
             final_score = (
                 weight_altman * altman_norm
                 + weight_ohlson * ohlson_norm
                 + weight_sentiment * sentiment_score * 100
             )
-            
-            margin_high = sentiment_score*0.1*(100-final_score)
-            margin_low = (1-sentiment_score)*0.1*(100-final_score)
-            
-            score_min, score_max = final_score - margin_low, final_score + margin_high
 
             results[ticker] = {
                 'base_score': round(final_score, 2),
-                'score_min': round(score_min, 2),
-                'score_max': round(score_max, 2),
-                'altman_z': round(altman_z_score(fin), 2),
-                'ohlson_o': round(ohlson_o_score(fin), 2),
-                'sentiment': sentiment_score
+                'altman_z': round(altman, 2),
+                'ohlson_o': round(ohlson, 2),
+                'sentiment': sentiment_score,
+                'estimated_fields': sorted(estimated),
+                'sector': info.get('sector') or 'Unknown',
+                # Unrounded inputs to the final score, kept for what-if reweighting
+                'components': {'altman_z': altman, 'ohlson_o': ohlson, 'sentiment': sentiment_score}
             }
+            band_inputs.append((ticker, fin, estimated, headline_count, headline_std))
             logger.info(f"{ticker}: Score = {final_score:.2f}")
         except Exception as e:
             logger.error(f"Failed to process {ticker}: {str(e)}")
             failed_tickers.append(ticker)
+            if errors is not None:
+                errors[ticker] = str(e) or type(e).__name__
+
+    if band_inputs:
+        # Score range: 5th-95th percentile of the score under perturbed inputs
+        low, high = score_bands(
+            [fin for _, fin, _, _, _ in band_inputs],
+            estimated=[est for _, _, est, _, _ in band_inputs],
+            sentiment_counts=[n for _, _, _, n, _ in band_inputs],
+            sentiment_stds=[sd for _, _, _, _, sd in band_inputs],
+            weights=(weight_altman, weight_ohlson, weight_sentiment),
+            altman_range=ALTMAN_RANGE,
+            ohlson_range=OHLSON_RANGE,
+        )
+        for i, (ticker, _, _, _, _) in enumerate(band_inputs):
+            results[ticker]['score_min'] = round(float(low[i]), 2)
+            results[ticker]['score_max'] = round(float(high[i]), 2)
+
     if failed_tickers:
         logger.warning(f"Failed tickers: {failed_tickers}")
     logger.info(f"Processed {len(results)} of {len(tickers)}")
@@ -191,9 +254,10 @@ def get_score_breakdown_data():
         'altman': altman_breakdown,
         'ohlson': ohlson_breakdown,
         'weights': {
-            'altman_weight': 50,    # 50% of total score
-            'ohlson_weight': 40,    # 40% of total score  
-            'sentiment_weight': 10  # 10% of total score
+            # Percent of total score
+            'altman_weight': round(SCORE_WEIGHTS[0] * 100),
+            'ohlson_weight': round(SCORE_WEIGHTS[1] * 100),
+            'sentiment_weight': round(SCORE_WEIGHTS[2] * 100)
         }
     }
 
@@ -221,10 +285,10 @@ def get_detailed_breakdown_for_ticker(ticker: str):
 
 
 # Example usage
-
-results = fetch_and_compute_credit_scores(tickers=['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'ADBE', 'DELL', 'IBM', 'NFLX', 'NVDA', 'META', 'INTC'])
-for ticker, score_data in results.items():
-    print(f"{ticker}: Base Score = {score_data['base_score']}, "
-          f"Range = ({score_data['score_min']}, {score_data['score_max']}), "
-          f"Altman Z = {score_data['altman_z']}, Ohlson O = {score_data['ohlson_o']}, "
-          f"Sentiment = {score_data['sentiment']}")
+if __name__ == "__main__":
+    results = fetch_and_compute_credit_scores(tickers=['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'ADBE', 'DELL', 'IBM', 'NFLX', 'NVDA', 'META', 'INTC'])
+    for ticker, score_data in results.items():
+        print(f"{ticker}: Base Score = {score_data['base_score']}, "
+              f"Range = ({score_data['score_min']}, {score_data['score_max']}), "
+              f"Altman Z = {score_data['altman_z']}, Ohlson O = {score_data['ohlson_o']}, "
+              f"Sentiment = {score_data['sentiment']}")
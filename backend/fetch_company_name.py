@@ -1,8 +1,10 @@
 import yfinance as yf
+from ticker_directory import directory
 
 def get_company_name_yfinance(ticker):
     """
-    Fetches the company name from yfinance for a given ticker.
+    Fetches the company name for a given ticker, from the local ticker
+    directory when it is known and from yfinance otherwise.
     
     Args:
         ticker (str): Stock ticker symbol.
@@ -10,11 +12,16 @@ def get_company_name_yfinance(ticker):
     Returns:
         str: Company name, or an error message if not found.
     """
+    company_name = directory.name(ticker)
+    if company_name:
+        return company_name
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
         company_name = info.get('longName') or info.get('shortName')
         if company_name:
+            # Remember it so later lookups stay local
+            directory.upsert_many([(ticker, company_name)])
             return company_name
         else:
             return "Company name not available for this ticker."
@@ -22,4 +29,5 @@ def get_company_name_yfinance(ticker):
         return f"Error fetching data for {ticker}: {str(e)}"
 
 # Example usage:
-print(get_company_name_yfinance("AAPL"))
+if __name__ == "__main__":
+    print(get_company_name_yfinance("AAPL"))
@@ -109,21 +109,31 @@ def _series_two(df: Optional[pd.DataFrame], candidates: List[str]) -> Optional[p
 # ---------------------------
 # Main computation
 # ---------------------------
-def fetch_ratios_no_nans(ticker_symbol: str) -> Dict[str, str]:
-    log.info("Fetching data for %s", ticker_symbol)
-    tkr = yf.Ticker(ticker_symbol)
+def fetch_ratios_no_nans(ticker_symbol: str, store=None) -> Dict[str, str]:
+    # Read from a local StatementStore when it has the ticker, else from yfinance
+    if store is not None and ticker_symbol in store:
+        log.info("Loading stored statements for %s", ticker_symbol)
+        statements, info = store.load(ticker_symbol)
+        bal_yr = statements["balance_sheet"]
+        bal_q = statements["quarterly_balance_sheet"]
+        inc_yr = statements["financials"]
+        inc_q = statements["quarterly_financials"]
+        fast = {}
+    else:
+        log.info("Fetching data for %s", ticker_symbol)
+        tkr = yf.Ticker(ticker_symbol)
 
-    # Pull statements
-    try:
-        bal_yr = tkr.balance_sheet
-        bal_q = tkr.quarterly_balance_sheet
-        inc_yr = tkr.financials          # annual income statement
-        inc_q = tkr.quarterly_financials # quarterly income statement
-        info = tkr.info or {}
-        fast = getattr(tkr, "fast_info", {}) or {}
-    except Exception as e:
-        log.error("Failed to fetch statements: %s", e)
-        raise
+        # Pull statements
+        try:
+            bal_yr = tkr.balance_sheet
+            bal_q = tkr.quarterly_balance_sheet
+            inc_yr = tkr.financials          # annual income statement
+            inc_q = tkr.quarterly_financials # quarterly income statement
+            info = tkr.info or {}
+            fast = getattr(tkr, "fast_info", {}) or {}
+        except Exception as e:
+            log.error("Failed to fetch statements: %s", e)
+            raise
 
     # --- Price/Earnings (trailing) ---
     # Preferred: info['trailingPE']; else compute from price / trailingEps
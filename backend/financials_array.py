@@ -0,0 +1,199 @@
+"""
+Compact struct-of-arrays container for CompanyFinancials records.
+
+One pydantic model per issuer-quarter costs around a kilobyte; here each
+CompanyFinancials field is a single float64 column, tickers are
+dictionary-encoded into int32 codes and periods are datetime64[D], so a row
+costs ~100 bytes of column data and whole columns can be fed straight into the vectorized
+scoring code (altman_z_score / ohlson_o_score accept array attributes, and
+uncertainty.score_band_arrays takes the columns() dict).
+
+FinancialsRow is a __slots__ view onto one row for code that expects
+attribute access like a CompanyFinancials instance.
+"""
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from credtech import CompanyFinancials
+
+FIELDS: List[str] = list(CompanyFinancials.model_fields)
+
+
+class FinancialsRow:
+    """Read-only view of one FinancialsArray row with CompanyFinancials attributes."""
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array: 'FinancialsArray', index: int):
+        self._array = array
+        self._index = index
+
+    @property
+    def ticker(self) -> str:
+        return self._array._ticker_names[self._array._ticker_codes[self._index]]
+
+    @property
+    def period(self) -> Optional[pd.Timestamp]:
+        value = self._array._periods[self._index]
+        return None if np.isnat(value) else pd.Timestamp(value)
+
+    def to_model(self) -> CompanyFinancials:
+        return CompanyFinancials(**{name: getattr(self, name) for name in FIELDS})
+
+    def __repr__(self) -> str:
+        return f"FinancialsRow({self.ticker!r}, {self.period}, index={self._index})"
+
+
+def _field_property(name: str) -> property:
+    return property(lambda self: float(self._array._columns[name][self._index]))
+
+
+for _name in FIELDS:
+    setattr(FinancialsRow, _name, _field_property(_name))
+
+
+class FinancialsArray:
+    """Growable column store of issuer-period CompanyFinancials records."""
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {name: np.empty(capacity) for name in FIELDS}
+        self._ticker_codes = np.empty(capacity, dtype=np.int32)
+        self._periods = np.empty(capacity, dtype='datetime64[D]')
+        self._ticker_names: List[str] = []
+        self._ticker_lookup: Dict[str, int] = {}
+
+    # ---------------------------
+    # Construction
+    # ---------------------------
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._ticker_codes)
+        if needed <= capacity:
+            return
+        # Amortized doubling keeps appends O(1)
+        new_capacity = max(needed, capacity * 2)
+        for name, col in self._columns.items():
+            grown = np.empty(new_capacity)
+            grown[:self._size] = col[:self._size]
+            self._columns[name] = grown
+        for attr, dtype in (('_ticker_codes', np.int32), ('_periods', 'datetime64[D]')):
+            grown = np.empty(new_capacity, dtype=dtype)
+            grown[:self._size] = getattr(self, attr)[:self._size]
+            setattr(self, attr, grown)
+
+    def _code(self, ticker: str) -> int:
+        code = self._ticker_lookup.get(ticker)
+        if code is None:
+            code = len(self._ticker_names)
+            self._ticker_names.append(ticker)
+            self._ticker_lookup[ticker] = code
+        return code
+
+    def append(self, ticker: str, fin, period=None) -> int:
+        """Append one record (a CompanyFinancials, row view or mapping); returns its row index."""
+        self._reserve(1)
+        i = self._size
+        get = fin.get if isinstance(fin, dict) else lambda name: getattr(fin, name)
+        for name in FIELDS:
+            self._columns[name][i] = get(name)
+        self._ticker_codes[i] = self._code(ticker)
+        self._periods[i] = np.datetime64('NaT') if period is None else np.datetime64(pd.Timestamp(period).date(), 'D')
+        self._size += 1
+        return i
+
+    @classmethod
+    def from_models(cls, tickers: Iterable[str], models: Iterable[CompanyFinancials],
+                    periods: Optional[Iterable] = None) -> 'FinancialsArray':
+        tickers, models = list(tickers), list(models)
+        n = len(models)
+        arr = cls(capacity=n)
+        # Fill whole columns at once rather than appending row by row
+        for name in FIELDS:
+            arr._columns[name][:n] = np.fromiter((getattr(fin, name) for fin in models), dtype=float, count=n)
+        arr._ticker_codes[:n] = [arr._code(ticker) for ticker in tickers]
+        if periods is None:
+            arr._periods[:n] = np.datetime64('NaT')
+        else:
+            arr._periods[:n] = pd.to_datetime(list(periods)).to_numpy(dtype='datetime64[D]')
+        arr._size = n
+        return arr
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'FinancialsArray':
+        """Build from a long DataFrame with 'ticker', optional 'period' and one column per field."""
+        n = len(df)
+        arr = cls(capacity=n)
+        for name in FIELDS:
+            arr._columns[name][:n] = df[name].to_numpy(dtype=float)
+        codes, names = pd.factorize(df['ticker'].astype(str))
+        arr._ticker_codes[:n] = codes
+        arr._ticker_names = list(names)
+        arr._ticker_lookup = {t: c for c, t in enumerate(arr._ticker_names)}
+        if 'period' in df:
+            arr._periods[:n] = pd.to_datetime(df['period']).to_numpy(dtype='datetime64[D]')
+        else:
+            arr._periods[:n] = np.datetime64('NaT')
+        arr._size = n
+        return arr
+
+    # ---------------------------
+    # Access
+    # ---------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> FinancialsRow:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return FinancialsRow(self, index)
+
+    def __iter__(self) -> Iterator[FinancialsRow]:
+        return (FinancialsRow(self, i) for i in range(self._size))
+
+    def column(self, name: str) -> np.ndarray:
+        """View (no copy) of one field over the filled rows."""
+        return self._columns[name][:self._size]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: self.column(name) for name in FIELDS}
+
+    def as_namespace(self) -> SimpleNamespace:
+        """Columns as attributes, for the array-aware scoring functions in credtech."""
+        return SimpleNamespace(**self.columns())
+
+    @property
+    def tickers(self) -> np.ndarray:
+        return np.array(self._ticker_names, dtype=object)[self._ticker_codes[:self._size]]
+
+    @property
+    def periods(self) -> np.ndarray:
+        return self._periods[:self._size]
+
+    def rows_for(self, ticker: str) -> np.ndarray:
+        """Row indices belonging to one ticker."""
+        code = self._ticker_lookup.get(ticker)
+        if code is None:
+            return np.array([], dtype=np.intp)
+        return np.flatnonzero(self._ticker_codes[:self._size] == code)
+
+    @property
+    def nbytes(self) -> int:
+        return (sum(col.nbytes for col in self._columns.values())
+                + self._ticker_codes.nbytes + self._periods.nbytes)
+
+    # ---------------------------
+    # Conversion
+    # ---------------------------
+    def to_models(self) -> List[CompanyFinancials]:
+        return [row.to_model() for row in self]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        data = {'ticker': self.tickers, 'period': self.periods}
+        data.update({name: self.column(name).copy() for name in FIELDS})
+        return pd.DataFrame(data)
@@ -0,0 +1,160 @@
+"""
+Near-duplicate headline collapsing ahead of sentiment inference.
+
+Google News returns the same story syndicated under many outlets, often with
+the outlet appended ("... - Reuters") and small wording changes. Headlines are
+normalized, split into word-bigram shingles and MinHashed; LSH banding finds
+candidate clusters and the estimated Jaccard similarity decides membership.
+Each cluster is scored by the model once, across tickers and polls, and every
+variant reuses that score.
+"""
+import logging
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: candidate pairs from ~0.5 Jaccard upwards
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.6
+SHINGLE_SIZE = 2
+# Oldest clusters are forgotten past this many
+MAX_CLUSTERS = 100_000
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, (1 << 31) - 1, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, (1 << 31) - 1, NUM_PERM, dtype=np.uint64)
+# Trailing " - Outlet" attribution added by news aggregators
+_SOURCE_SUFFIX = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,40}$")
+
+
+def normalize_headline(title: str) -> str:
+    """Lowercased, accent- and punctuation-free headline without the outlet suffix."""
+    title = _SOURCE_SUFFIX.sub("", title.strip())
+    title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", title.lower()).split())
+
+
+def _signature(text: str) -> np.ndarray:
+    words = text.split()
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))}
+    # 31-bit shingle hashes keep a * x + b inside uint64
+    hashes = np.fromiter((zlib.crc32(s.encode()) & 0x7FFFFFFF for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def _band_keys(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+class HeadlineDeduper:
+    """Streaming MinHash/LSH clustering of headlines with a per-cluster model score."""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, max_clusters: int = MAX_CLUSTERS):
+        self.threshold = threshold
+        self.max_clusters = max_clusters
+        self._lock = threading.Lock()
+        # cluster id -> [normalized text, signature, band keys, score, scored?]
+        self._clusters: "OrderedDict[int, list]" = OrderedDict()
+        self._exact: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._next_id = 0
+        self.headlines = 0
+        self.inference_calls = 0
+
+    def _match(self, text: str, signature: np.ndarray, keys) -> Optional[int]:
+        cluster = self._exact.get(text)
+        if cluster is not None:
+            return cluster
+        best, best_similarity = None, self.threshold
+        candidates = {c for key in keys for c in self._buckets.get(key, ())}
+        for c in candidates:
+            similarity = float(np.mean(self._clusters[c][1] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = c, similarity
+        return best
+
+    def _add_cluster(self, text: str, signature: np.ndarray, keys) -> int:
+        cluster = self._next_id
+        self._next_id += 1
+        self._clusters[cluster] = [text, signature, keys, None, False]
+        self._exact[text] = cluster
+        for key in keys:
+            self._buckets.setdefault(key, []).append(cluster)
+        if len(self._clusters) > self.max_clusters:
+            self._evict()
+        return cluster
+
+    def _evict(self) -> None:
+        cluster, (text, _, keys, _, _) = self._clusters.popitem(last=False)
+        if self._exact.get(text) == cluster:
+            del self._exact[text]
+        for key in keys:
+            members = self._buckets.get(key)
+            if members is not None:
+                members.remove(cluster)
+                if not members:
+                    del self._buckets[key]
+
+    def assign(self, titles: Sequence[str]) -> List[int]:
+        """Cluster id for each headline, creating clusters for unseen stories."""
+        clusters = []
+        with self._lock:
+            for title in titles:
+                text = normalize_headline(title)
+                if text in self._exact:
+                    clusters.append(self._exact[text])
+                    continue
+                signature = _signature(text)
+                keys = _band_keys(signature)
+                cluster = self._match(text, signature, keys)
+                clusters.append(self._add_cluster(text, signature, keys) if cluster is None else cluster)
+        return clusters
+
+    def collapse(self, titles: Sequence[str], score_fn: Callable[[List[str]], list]) -> Tuple[list, List[int]]:
+        """
+        Score headlines, running `score_fn` only on one representative of each
+        cluster that has not been scored yet.
+
+        Returns:
+            scores (list): score_fn output per headline (shared within a cluster)
+            clusters (list): Cluster id per headline
+        """
+        clusters = self.assign(titles)
+        with self._lock:
+            pending = {}
+            for title, cluster in zip(titles, clusters):
+                if cluster in self._clusters and not self._clusters[cluster][4] and cluster not in pending:
+                    pending[cluster] = title
+        # The model runs outside the lock so other tickers are not held up
+        fresh = dict(zip(pending, score_fn(list(pending.values())))) if pending else {}
+        with self._lock:
+            self.headlines += len(titles)
+            self.inference_calls += len(pending)
+            for cluster, score in fresh.items():
+                if cluster in self._clusters:
+                    self._clusters[cluster][3:5] = [score, True]
+            scores = [fresh[c] if c in fresh else self._clusters[c][3] if c in self._clusters else None
+                      for c in clusters]
+        if titles:
+            logger.info(f"{len(titles)} headlines, {len(pending)} sent to the model")
+        return scores, clusters
+
+    def stats(self) -> dict:
+        return {
+            'headlines': self.headlines,
+            'clusters': len(self._clusters),
+            'inference_calls': self.inference_calls,
+            'inference_calls_saved': self.headlines - self.inference_calls,
+        }
+
+
+headline_deduper = HeadlineDeduper()
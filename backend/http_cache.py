@@ -0,0 +1,117 @@
+"""
+HTTP-level caching helpers shared by the Flask and Quart apps.
+
+`json_response` serializes a payload deterministically, derives a strong ETag
+from the bytes, answers `If-None-Match` with 304, sets Cache-Control from the
+caller's max-age and gzips large bodies when the client accepts it. It returns
+a (body, status, headers) tuple that either framework can return as-is.
+
+The ETag covers what a response says, not when it was computed: top-level
+UNHASHED_FIELDS are left out of the hash, so recomputing an unchanged score
+keeps its ETag. The computation time goes out as Last-Modified instead.
+"""
+import gzip
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Mapping, Optional, Tuple
+
+# Bodies smaller than this are sent uncompressed; gzip overhead isn't worth it
+COMPRESS_MIN_BYTES = 1024
+# Payload fields recording when it was computed, excluded from the ETag
+UNHASHED_FIELDS = ('timestamp',)
+# Methods a matching If-None-Match answers with 304; any other gets 412 (RFC 9110 13.1.2)
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified_since(last_modified: float, if_modified_since: str) -> bool:
+    """Whether a resource last modified at `last_modified` (epoch seconds) is unchanged since the header date."""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(last_modified) <= since
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def json_response(payload: Any, request_headers: Mapping[str, str], max_age: int = 0,
+                  status: int = 200, last_modified: Optional[float] = None,
+                  method: str = 'GET') -> Tuple[bytes, int, dict]:
+    """
+    Build a cacheable JSON response.
+
+    Args:
+        payload: JSON-serializable response body
+        request_headers: Incoming request headers (If-None-Match, Accept-Encoding)
+        max_age: Seconds the client may reuse the response without revalidating;
+                 0 means it must revalidate with the ETag every time
+        last_modified: Epoch seconds the payload was computed, sent as Last-Modified
+        method: Request method; conditional non-GET/HEAD requests get 412, not 304
+
+    Returns:
+        (body, status, headers) for Flask or Quart to send
+    """
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    compress = len(body) >= COMPRESS_MIN_BYTES and accepts_gzip(request_headers.get("Accept-Encoding", ""))
+
+    hashed = body
+    if isinstance(payload, dict) and any(field in payload for field in UNHASHED_FIELDS):
+        stable = {key: value for key, value in payload.items() if key not in UNHASHED_FIELDS}
+        hashed = json.dumps(stable, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    # The gzip representation gets its own ETag so caches never mix the two up
+    etag = compute_etag(hashed)
+    if compress:
+        etag = etag[:-1] + '-gzip"'
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    if_none_match = request_headers.get("If-None-Match", "")
+    if if_none_match:
+        if etag_matches(etag, if_none_match):
+            return b"", 304 if method.upper() in SAFE_METHODS else 412, headers
+    elif (last_modified is not None and method.upper() in SAFE_METHODS
+          and not_modified_since(last_modified, request_headers.get("If-Modified-Since", ""))):
+        return b"", 304, headers
+
+    if compress:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    headers["Content-Type"] = "application/json"
+    return body, status, headers
@@ -0,0 +1,85 @@
+"""
+Concurrent-request load test for the analysis API.
+
+Fires a fixed number of requests at each server with a fixed number in flight
+and reports throughput and latency percentiles, so the Flask (WSGI) and
+Quart (ASGI) serving modes can be compared side by side:
+
+    python app.py                                   # :5000
+    hypercorn asgi_app:app --bind 0.0.0.0:5001      # :5001
+    python load_test.py --url http://localhost:5000 --url http://localhost:5001
+"""
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def _request(url: str, body: Optional[bytes], timeout: float) -> float:
+    """Issue one request and return its latency in seconds (negative on failure or a non-2xx/304 status)."""
+    req = urllib.request.Request(url, data=body, method="POST" if body else "GET")
+    if body:
+        req.add_header("Content-Type", "application/json")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+    except urllib.error.HTTPError as e:
+        # urllib raises on 304 too; that is a successful conditional response
+        e.read()
+        if e.code != 304:
+            return -1.0
+    except Exception:
+        return -1.0
+    return time.perf_counter() - start
+
+
+def run_load(base_url: str, path: str, total: int, concurrency: int,
+             body: Optional[bytes] = None, timeout: float = 120.0) -> Dict[str, float]:
+    url = base_url.rstrip("/") + path
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda _: _request(url, body, timeout), range(total)))
+    elapsed = time.perf_counter() - start
+
+    ok = np.array([l for l in latencies if l >= 0])
+    return {
+        "requests": total,
+        "errors": total - len(ok),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(ok, 50) * 1000) if len(ok) else float("nan"),
+        "p95_ms": float(np.percentile(ok, 95) * 1000) if len(ok) else float("nan"),
+        "max_ms": float(ok.max() * 1000) if len(ok) else float("nan"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", required=True, help="Server base URL (repeat to compare)")
+    parser.add_argument("--path", default="/api/company-analysis/AAPL")
+    parser.add_argument("--batch", help="Comma-separated tickers; POSTs to /api/batch-analysis instead")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    path, body = args.path, None
+    if args.batch:
+        path = "/api/batch-analysis"
+        body = json.dumps({"tickers": args.batch.split(",")}).encode()
+
+    print(f"{args.requests} requests to {path}, {args.concurrency} in flight\n")
+    for base_url in args.url:
+        stats = run_load(base_url, path, args.requests, args.concurrency, body)
+        print(f"{base_url}: {stats['throughput_rps']:.2f} req/s, "
+              f"p50 = {stats['p50_ms']:.0f} ms, p95 = {stats['p95_ms']:.0f} ms, "
+              f"max = {stats['max_ms']:.0f} ms, errors = {stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Incremental rolling sentiment time series per ticker.
+
+Every poll of the news feed adds only stories not seen before; headlines go
+through the near-duplicate collapser (headline_dedup) first, so the model
+runs only on stories new to every ticker. Each ticker keeps its timestamped
+headline scores, a time-decayed EWMA and daily aggregates, all updated in
+O(new headlines), so the credit score can use the smoothed value and trend
+queries never rerun inference.
+
+The EWMA works on irregular timestamps by keeping decayed sums relative to
+the latest observation time: an observation `dt` seconds older than the
+reference contributes weight 0.5 ** (dt / half_life). Mean, variance and
+effective sample size all come from those running sums.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from headline_dedup import headline_deduper
+from unstructured import fetch_headlines, score_headlines
+
+logger = logging.getLogger(__name__)
+
+# Half-life of a headline's influence on the smoothed sentiment (hours)
+HALF_LIFE_HOURS = float(os.environ.get("CREDTECH_SENTIMENT_HALF_LIFE_HOURS", "72"))
+# Headline observations kept per ticker for dedup and history
+MAX_OBSERVATIONS = 5000
+# Sentiment reported when no opinionated headline has been seen
+NEUTRAL_SENTIMENT = 0.5
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+
+
+class SentimentSeries:
+    """Timestamped headline scores for one ticker with an incremental EWMA and daily aggregates."""
+
+    def __init__(self, half_life_hours: float = HALF_LIFE_HOURS, max_observations: int = MAX_OBSERVATIONS):
+        self.half_life = half_life_hours * 3600
+        self.observations = deque()  # (timestamp, headline, scaled score or None, dedup key), arrival order
+        self.max_observations = max_observations
+        self._seen = set()
+        # Decayed sums relative to self._ref_time: weights, weights^2, w*x, w*x^2
+        self._ref_time: Optional[float] = None
+        self._w = self._w2 = self._wx = self._wx2 = 0.0
+        # date -> [sum, count] of scaled scores
+        self.daily: Dict[str, List[float]] = {}
+        self.last_update: Optional[float] = None
+
+    def is_new(self, key) -> bool:
+        return key not in self._seen
+
+    def add(self, observations: Iterable[Tuple[float, str, Optional[float]]], keys: Optional[Iterable] = None) -> int:
+        """
+        Add (timestamp, headline, scaled score or None for neutral) observations;
+        returns how many were new. Observations are deduplicated on `keys` (e.g.
+        near-duplicate cluster ids) when given, otherwise on the headline text.
+        """
+        added = 0
+        observations = list(observations)
+        keys = [headline for _, headline, _ in observations] if keys is None else list(keys)
+        for (ts, headline, score), key in zip(observations, keys):
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.observations.append((ts, headline, score, key))
+            if len(self.observations) > self.max_observations:
+                self._seen.discard(self.observations.popleft()[3])
+            added += 1
+            if score is not None:
+                self._accumulate(ts, score)
+                bucket = self.daily.setdefault(_day(ts), [0.0, 0])
+                bucket[0] += score
+                bucket[1] += 1
+        self.last_update = time.time()
+        return added
+
+    def _accumulate(self, ts: float, score: float) -> None:
+        if self._ref_time is None:
+            self._ref_time = ts
+        if ts > self._ref_time:
+            # Move the reference forward: decay everything accumulated so far
+            decay = 0.5 ** ((ts - self._ref_time) / self.half_life)
+            self._w *= decay
+            self._w2 *= decay * decay
+            self._wx *= decay
+            self._wx2 *= decay
+            self._ref_time = ts
+            weight = 1.0
+        else:
+            # Late arrival: weight it by its age relative to the reference
+            weight = 0.5 ** ((self._ref_time - ts) / self.half_life)
+        self._w += weight
+        self._w2 += weight * weight
+        self._wx += weight * score
+        self._wx2 += weight * score * score
+
+    def smoothed(self) -> Tuple[float, float, float]:
+        """
+        Returns:
+            ewma (float): Time-decayed mean scaled sentiment
+            effective_count (float): Kish effective sample size of the decayed weights
+            std (float): Weighted standard deviation of the headline scores
+        """
+        if self._w <= 0:
+            return NEUTRAL_SENTIMENT, 0.0, 0.0
+        mean = self._wx / self._w
+        var = max(self._wx2 / self._w - mean * mean, 0.0)
+        return mean, self._w * self._w / self._w2, math.sqrt(var)
+
+    def trend(self, days: int = 30) -> List[dict]:
+        """Daily mean sentiment and headline counts for the most recent `days` days with news."""
+        recent = sorted(self.daily.items())[-days:]
+        return [{'date': day, 'mean': round(total / count, 4), 'count': count} for day, (total, count) in recent]
+
+
+class SentimentBook:
+    """Sentiment series for every ticker polled in this process."""
+
+    def __init__(self):
+        self._series: Dict[str, SentimentSeries] = {}
+        self._lock = threading.Lock()
+        self._ticker_locks: Dict[str, threading.Lock] = {}
+
+    def series(self, ticker: str) -> Optional[SentimentSeries]:
+        return self._series.get(ticker)
+
+    def ensure(self, ticker: str) -> Tuple[SentimentSeries, threading.Lock]:
+        """The ticker's series and update lock, created on first use."""
+        with self._lock:
+            return (self._series.setdefault(ticker, SentimentSeries()),
+                    self._ticker_locks.setdefault(ticker, threading.Lock()))
+
+    def update(self, ticker: str) -> SentimentSeries:
+        """
+        Poll the news feed and add headlines this ticker has not seen. Near-duplicate
+        variants share one observation and only stories new to every ticker reach the model.
+        """
+        series, ticker_lock = self.ensure(ticker)
+        with ticker_lock:
+            headlines = fetch_headlines(ticker)
+            scores, clusters = headline_deduper.collapse([title for _, title in headlines], score_headlines)
+            added = series.add(((ts, title, score) for (ts, title), score in zip(headlines, scores)), keys=clusters)
+        logger.info(f"{ticker}: {added} new stories added")
+        return series
+
+
+sentiment_book = SentimentBook()
+
+
+def update_sentiment(ticker: str) -> Tuple[float, float, float]:
+    """Poll news for a ticker and return its smoothed (sentiment, effective count, std)"""
+    return sentiment_book.update(ticker).smoothed()
+
+
+def sentiment_trend_payload(ticker: str, days: int = 30) -> Tuple[dict, int]:
+    """Trend of a ticker's stored sentiment, without polling or inference"""
+    series = sentiment_book.series(ticker)
+    if series is None:
+        return {'error': f'No sentiment history for {ticker}'}, 404
+    smoothed, effective_count, std = series.smoothed()
+    return {
+        'ticker': ticker,
+        'smoothed': round(smoothed, 4),
+        'effective_count': round(effective_count, 2),
+        'std': round(std, 4),
+        'headline_count': len(series.observations),
+        'half_life_hours': series.half_life / 3600,
+        'daily': series.trend(days),
+        'last_update': series.last_update,
+        'success': True
+    }, 200
@@ -0,0 +1,325 @@
+"""
+Memory-mapped columnar store for historical financial statements.
+
+Statements are kept in long form (ticker, statement, line_item, period,
+value) as Arrow IPC segment files under one directory. New filings are
+written as a new segment, so nothing is ever rewritten; segment numbers are
+claimed with an exclusive hard link, so writers in different processes never
+overwrite each other. On lookup later segments win for the same (statement,
+line_item, period). Segments are
+opened with memory mapping, rows are sorted by ticker and each segment's
+footer metadata records every ticker's row range, so a lookup is a zero-copy
+slice of the mapped file and only that ticker's rows are materialized into
+the yfinance-shaped DataFrames the ratio code expects. For universe scoring
+the latest quarter of every ticker is extracted at once: the line items the
+scorer reads are filtered out in Arrow and pivoted per statement.
+
+    python statement_store.py ingest data/statements AAPL MSFT   # snapshot yfinance
+    python statement_store.py score  data/statements             # score from disk
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+
+logger = logging.getLogger(__name__)
+
+# yfinance statement attributes kept in the store
+STATEMENTS = ['balance_sheet', 'quarterly_balance_sheet', 'financials', 'quarterly_financials']
+INFO = 'info'
+# Non-numeric info fields worth keeping (stored in the text column)
+INFO_TEXT_FIELDS = ['sector', 'industry', 'longName', 'shortName', 'currency']
+
+SCHEMA = pa.schema([
+    ('ticker', pa.string()),
+    ('statement', pa.string()),
+    ('line_item', pa.string()),
+    ('period', pa.timestamp('s')),
+    ('value', pa.float64()),
+    ('text', pa.string()),
+])
+_SEGMENT_RE = re.compile(r"segment-(\d{6})\.arrow$")
+
+
+def _long_columns(ticker: str, statements: Dict[str, pd.DataFrame], info: Optional[dict]) -> Dict[str, list]:
+    """Flatten yfinance-shaped statements (line items x periods) and info into long column chunks."""
+    chunks = {name: [] for name in SCHEMA.names}
+
+    def add(statement, line_items, periods, values, texts=None):
+        n = len(values)
+        chunks['ticker'].append(np.full(n, ticker, dtype=object))
+        chunks['statement'].append(np.full(n, statement, dtype=object))
+        chunks['line_item'].append(np.asarray(line_items, dtype=object))
+        chunks['period'].append(np.asarray(periods, dtype='datetime64[s]'))
+        chunks['value'].append(np.asarray(values, dtype=float))
+        chunks['text'].append(np.full(n, None, dtype=object) if texts is None else np.asarray(texts, dtype=object))
+
+    for name, df in statements.items():
+        if df is None or df.empty:
+            continue
+        try:
+            values = df.to_numpy(dtype=float, na_value=np.nan)
+        except (TypeError, ValueError):
+            values = df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        rows, cols = np.nonzero(~np.isnan(values))
+        periods = pd.to_datetime(df.columns).to_numpy(dtype='datetime64[s]')
+        add(name, df.index.astype(str).to_numpy()[rows], periods[cols], values[rows, cols])
+
+    if info:
+        items, values, texts = [], [], []
+        for key, value in info.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value):
+                items.append(key), values.append(float(value)), texts.append(None)
+            elif key in INFO_TEXT_FIELDS and isinstance(value, str):
+                items.append(key), values.append(np.nan), texts.append(value)
+        if items:
+            add(INFO, items, np.full(len(items), np.datetime64('NaT'), dtype='datetime64[s]'), values, texts)
+    return chunks
+
+
+class StatementStore:
+    """Append-only, memory-mapped Arrow IPC store of statements keyed by ticker, line item and period."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        # (segment number, mapped table, {ticker: (start, stop)}) in write order
+        self._segments: List[Tuple[int, pa.Table, Dict[str, Tuple[int, int]]]] = []
+        # Latest-quarter snapshot of every ticker, rebuilt lazily after reloads
+        self._latest: Optional[Dict[str, Tuple[dict, dict, dict]]] = None
+        self.reload()
+
+    # ---------------------------
+    # Segments
+    # ---------------------------
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.root):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _path(self, number: int) -> str:
+        return os.path.join(self.root, f"segment-{number:06d}.arrow")
+
+    def reload(self) -> None:
+        """Map any segments written since the store was opened (by this or another process)."""
+        with self._lock:
+            loaded = {number for number, _, _ in self._segments}
+            for number in self._segment_numbers():
+                if number in loaded:
+                    continue
+                source = pa.memory_map(self._path(number), 'r')
+                reader = pa.ipc.open_file(source)
+                table = reader.read_all()
+                meta = reader.schema.metadata or {}
+                index = {t: tuple(r) for t, r in json.loads(meta.get(b'ticker_index', b'{}')).items()}
+                self._segments.append((number, table, index))
+                self._latest = None
+            self._segments.sort(key=lambda seg: seg[0])
+
+    def append(self, records: Dict[str, Tuple[Dict[str, pd.DataFrame], Optional[dict]]]) -> Optional[str]:
+        """
+        Write a new segment holding statements for one or more tickers.
+
+        Args:
+            records: ticker -> (statements by yfinance attribute name, info dict)
+
+        Returns:
+            Path of the new segment, or None if there was nothing to write
+        """
+        # Rows grouped by ticker; each ticker's row range goes in the segment footer
+        columns = {name: [] for name in SCHEMA.names}
+        index, offset = {}, 0
+        for ticker in sorted(records):
+            statements, info = records[ticker]
+            chunks = _long_columns(ticker, statements, info)
+            n = sum(len(c) for c in chunks['value'])
+            if not n:
+                continue
+            for name in SCHEMA.names:
+                columns[name].extend(chunks[name])
+            index[ticker] = [offset, offset + n]
+            offset += n
+        if not offset:
+            return None
+
+        table = pa.table(
+            {name: pa.array(np.concatenate(columns[name]), type=SCHEMA.field(name).type, from_pandas=True)
+             for name in SCHEMA.names},
+            schema=SCHEMA,
+        )
+        table = table.replace_schema_metadata({'ticker_index': json.dumps(index)})
+
+        tmp = os.path.join(self.root, f".segment-{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(tmp, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        try:
+            with self._lock:
+                numbers = self._segment_numbers()
+                number = (numbers[-1] + 1) if numbers else 1
+                while True:
+                    path = self._path(number)
+                    try:
+                        # link() never replaces an existing file, so a writer in another
+                        # process that claimed this number first makes us take the next
+                        os.link(tmp, path)
+                        break
+                    except FileExistsError:
+                        number += 1
+        finally:
+            os.remove(tmp)
+        self.reload()
+        logger.info(f"Wrote {offset} rows for {len(index)} tickers to {path}")
+        return path
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+    def tickers(self) -> List[str]:
+        return sorted({t for _, _, index in self._segments for t in index})
+
+    def __contains__(self, ticker: str) -> bool:
+        return any(ticker in index for _, _, index in self._segments)
+
+    def _rows(self, ticker: str) -> pd.DataFrame:
+        slices = [table.slice(start, stop - start)
+                  for _, table, index in self._segments
+                  for start, stop in [index.get(ticker, (0, 0))] if stop > start]
+        if not slices:
+            return pd.DataFrame(columns=SCHEMA.names)
+        rows = pa.concat_tables(slices).to_pandas()
+        # Later segments win for the same cell
+        return rows.drop_duplicates(subset=['statement', 'line_item', 'period'], keep='last')
+
+    def load(self, ticker: str) -> Tuple[Dict[str, pd.DataFrame], dict]:
+        """
+        Statements and info for one ticker in yfinance shape.
+
+        Returns:
+            statements (dict): yfinance attribute name -> DataFrame of line items x
+                periods, most recent period first (empty DataFrame if absent)
+            info (dict): Stored info fields
+        """
+        rows = self._rows(ticker)
+        statements = {}
+        for name in STATEMENTS:
+            part = rows[rows['statement'] == name]
+            if part.empty:
+                statements[name] = pd.DataFrame()
+                continue
+            df = part.pivot(index='line_item', columns='period', values='value')
+            df = df[sorted(df.columns, reverse=True)]
+            df.index.name = None
+            df.columns.name = None
+            statements[name] = df
+
+        info = {}
+        for item, value, text in rows.loc[rows['statement'] == INFO, ['line_item', 'value', 'text']].itertuples(index=False):
+            info[item] = value if pd.isna(text) else text
+        return statements, info
+
+    def _build_latest(self) -> Dict[str, Tuple[dict, dict, dict]]:
+        # Imported here: only the scorer asks for the snapshot, and it owns the line-item names
+        from fetch_and_score import BALANCE_SHEET_KEYS, INCOME_KEYS, INFO_KEYS
+
+        tables = [table for _, table, _ in self._segments]
+        if not tables:
+            return {}
+        # Concatenating mapped tables only chains their chunks; the filter runs in Arrow,
+        # so pandas sees just the rows extract_financials reads
+        table = pa.concat_tables(tables)
+        items = {
+            'quarterly_balance_sheet': [k for keys in BALANCE_SHEET_KEYS.values() for k in keys],
+            'quarterly_financials': [k for keys in INCOME_KEYS.values() for k in keys],
+            INFO: INFO_KEYS,
+        }
+        mask = None
+        for statement, names in items.items():
+            part = pc.and_(pc.equal(table['statement'], statement),
+                           pc.is_in(table['line_item'], value_set=pa.array(names)))
+            mask = part if mask is None else pc.or_(mask, part)
+        rows = table.filter(mask).to_pandas()
+        rows = rows.drop_duplicates(subset=['ticker', 'statement', 'line_item', 'period'], keep='last')
+
+        # Keep each (ticker, statement)'s most recent period; info rows have no period
+        quarterly = rows['statement'] != INFO
+        latest_period = rows[quarterly].groupby(['ticker', 'statement'])['period'].transform('max')
+        keep = ~quarterly
+        keep[quarterly] = rows.loc[quarterly, 'period'] == latest_period
+        rows = rows[keep]
+        # Info text fields (sector) replace the empty numeric value
+        rows['cell'] = rows['text'].astype(object).where(rows['text'].notna(), rows['value'])
+
+        # One ticker x line item table per slot, turned into per-ticker dicts without NaN gaps
+        slots = []
+        for statement in items:
+            part = rows[rows['statement'] == statement]
+            wide = part.pivot(index='ticker', columns='line_item', values='value' if statement != INFO else 'cell')
+            names = wide.columns.tolist()
+            # v == v is False only for NaN, i.e. a line item the ticker does not report
+            slots.append({ticker: {name: v for name, v in zip(names, row) if v == v}
+                          for ticker, row in zip(wide.index.tolist(), wide.to_numpy().tolist())})
+        tickers = set().union(*slots)
+        return {ticker: tuple(slot.get(ticker, {}) for slot in slots) for ticker in tickers}
+
+    def latest_quarter(self, ticker: str) -> Tuple[dict, dict, dict]:
+        """
+        Most recent quarterly balance sheet and income statement values and info
+        for one ticker, as plain dicts (empty if absent).
+
+        Only the line items and info fields the scorer reads are kept. The
+        snapshot is built for every ticker at once (filtered in Arrow, then one
+        pivot per statement) and kept until new segments are loaded, so scoring
+        a whole universe avoids per-ticker pivots.
+        """
+        with self._lock:
+            if self._latest is None:
+                self._latest = self._build_latest()
+            latest = self._latest
+        return latest.get(ticker, ({}, {}, {}))
+
+
+def ingest_yfinance(store: StatementStore, tickers: List[str]) -> Optional[str]:
+    """Snapshot yfinance statements and info for tickers into one new segment"""
+    import yfinance as yf
+
+    records = {}
+    for ticker in tickers:
+        try:
+            stock = yf.Ticker(ticker)
+            statements = {name: getattr(stock, name) for name in STATEMENTS}
+            records[ticker] = (statements, stock.info or {})
+        except Exception as e:
+            logger.error(f"Failed to fetch statements for {ticker}: {str(e)}")
+    return store.append(records)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command, root, *symbols = sys.argv[1:]
+    store = StatementStore(root)
+    if command == "ingest":
+        ingest_yfinance(store, symbols)
+    elif command == "score":
+        from fetch_and_score import fetch_and_compute_credit_scores
+        symbols = symbols or store.tickers()
+        # Neutral sentiment so no model inference or network calls are needed
+        results = fetch_and_compute_credit_scores(symbols, store=store, sentiments={t: 0.5 for t in symbols})
+        for ticker, score_data in results.items():
+            print(f"{ticker}: Base Score = {score_data['base_score']}")
+    else:
+        raise SystemExit(f"Unknown command: {command}")
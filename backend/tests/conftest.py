@@ -0,0 +1,17 @@
+"""
+Backend modules import each other by bare name (they run from backend/), so
+put that directory on the path. Run with:  python -m pytest backend/tests
+"""
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# unstructured loads the FinBERT pipeline at import and polls Google News; tests
+# stay offline with a stand-in that finds no headlines
+if 'unstructured' not in sys.modules:
+    offline = types.ModuleType('unstructured')
+    offline.fetch_headlines = lambda ticker: []
+    offline.score_headlines = lambda headlines: [None] * len(headlines)
+    sys.modules['unstructured'] = offline
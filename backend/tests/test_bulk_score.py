@@ -0,0 +1,125 @@
+import threading
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import bulk_score
+from bulk_score import CsvSink, ParquetSink, run, score_chunk
+
+RATIOS = {"Debt to Equity": "1.5", "Current Ratio": "2.0", "ROE": "N/A"}
+
+
+def _score(ticker):
+    return {'base_score': 60.0, 'score_min': 55.0, 'score_max': 65.0, 'altman_z': 3.0, 'ohlson_o': -1.0,
+            'sentiment': 0.5, 'sector': 'Tech', 'estimated_fields': []}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake scorer: tickers in `failing` are not scored, those in `no_ratios` fail their ratio fetch."""
+    state = {'failing': set(), 'no_ratios': set(), 'scored': []}
+
+    def fetch(tickers, store=None, sentiments=None, errors=None):
+        state['scored'].extend(tickers)
+        for ticker in state['failing'] & set(tickers):
+            errors[ticker] = 'No balance sheet'
+        return {t: _score(t) for t in tickers if t not in state['failing']}
+
+    def ratios(ticker, store=None):
+        if ticker in state['no_ratios']:
+            raise ValueError('no statements')
+        return RATIOS
+
+    monkeypatch.setattr(bulk_score, 'fetch_and_compute_credit_scores', fetch)
+    monkeypatch.setattr(bulk_score, 'fetch_ratios_no_nans', ratios)
+    return state
+
+
+def _rows(sink):
+    if isinstance(sink, CsvSink):
+        return pd.read_csv(sink.path)
+    return pq.read_table(sink.path).to_pandas()
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def sink(request, tmp_path):
+    if request.param == 'csv':
+        return CsvSink(str(tmp_path / 'scores.csv'))
+    return ParquetSink(str(tmp_path / 'scores'))
+
+
+def test_chunk_rows_carry_status_and_reason(upstream):
+    upstream['failing'].add('BAD')
+    upstream['no_ratios'].add('HALF')
+    rows = {row['ticker']: row for row in score_chunk(['OK', 'BAD', 'HALF'])}
+    assert rows['OK']['status'] == 'ok' and rows['OK']['debt_to_equity'] == 1.5 and rows['OK']['roe'] is None
+    assert rows['BAD'] == {**rows['BAD'], 'status': 'failed', 'error': 'No balance sheet'}
+    assert rows['HALF']['status'] == 'partial' and rows['HALF']['base_score'] == 60.0
+
+
+def test_stopped_chunk_scores_nothing(upstream):
+    stop = threading.Event()
+    stop.set()
+    assert score_chunk(['OK'], stop=stop) == []
+    assert upstream['scored'] == []
+
+
+def test_rerun_skips_tickers_already_written(upstream, sink):
+    tickers = ['A', 'B', 'C', 'D', 'E']
+    assert run(tickers[:3], sink, workers=2, chunk_size=2, flush_rows=1) == {'ok': 3}
+    assert run(tickers, sink, workers=2, chunk_size=2) == {'ok': 2}
+    assert sorted(upstream['scored']) == tickers
+    assert sorted(_rows(sink)['ticker']) == tickers
+
+
+def test_retry_failed_rescores_only_failed_and_partial(upstream, sink):
+    upstream['failing'].add('BAD')
+    upstream['no_ratios'].add('HALF')
+    assert run(['OK', 'BAD', 'HALF'], sink, chunk_size=1) == {'ok': 1, 'failed': 1, 'partial': 1}
+
+    # A plain rerun treats every written ticker as done
+    assert run(['OK', 'BAD', 'HALF'], sink) == {}
+    assert sink.done() == {'OK', 'BAD', 'HALF'}
+    assert sink.done(retry_failed=True) == {'OK'}
+
+    upstream['failing'].clear()
+    upstream['no_ratios'].clear()
+    upstream['scored'].clear()
+    assert run(['OK', 'BAD', 'HALF'], sink, retry_failed=True) == {'ok': 2}
+    assert sorted(upstream['scored']) == ['BAD', 'HALF']
+    # The retried tickers get a new row, which is now their latest
+    latest = _rows(sink).groupby('ticker')['status'].last()
+    assert (latest == 'ok').all()
+    assert sink.done(retry_failed=True) == {'OK', 'BAD', 'HALF'}
+
+
+def test_csv_resume_drops_torn_last_line(upstream, tmp_path):
+    sink = CsvSink(str(tmp_path / 'scores.csv'))
+    run(['A', 'B'], sink)
+    with open(sink.path, 'a') as f:
+        f.write('C,ok,,61.0')
+    assert sink.done() == {'A', 'B'}
+    assert run(['A', 'B', 'C'], sink) == {'ok': 1}
+    assert sorted(_rows(sink)['ticker']) == ['A', 'B', 'C']
+
+
+def test_interrupt_flushes_chunks_finished_during_shutdown(upstream, sink, monkeypatch):
+    completed = bulk_score.as_completed
+
+    def interrupted(futures):
+        futures = list(futures)
+        # Both running chunks finish, but Ctrl-C arrives after only the first is consumed
+        futures[1].result()
+        yield futures[0]
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(bulk_score, 'as_completed', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(['A', 'B', 'C', 'D'], sink, workers=2, chunk_size=1)
+    written = set(_rows(sink)['ticker'])
+    assert {'A', 'B'} <= written
+    # Whatever was not written is scored by the next run
+    monkeypatch.setattr(bulk_score, 'as_completed', completed)
+    remaining = run(['A', 'B', 'C', 'D'], sink)
+    assert sum(remaining.values()) == 4 - len(written)
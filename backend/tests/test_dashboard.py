@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+import dashboard
+from cache import TTLCache
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    """Empty score/ratio/history caches and failure caches for the dashboard module."""
+    fresh = {name: TTLCache(1000) for name in ('score_cache', 'ratio_cache', 'history_cache')}
+    fresh.update({name: TTLCache(60) for name in ('ratio_failures', 'history_failures')})
+    for name, cache in fresh.items():
+        monkeypatch.setattr(dashboard, name, cache)
+    return fresh
+
+
+def _failing(calls):
+    def fetch(ticker):
+        calls.append(ticker)
+        raise ValueError('upstream down')
+    return fetch
+
+
+def test_failed_sections_are_not_refetched_within_ttl(caches, monkeypatch):
+    ratio_calls, history_calls = [], []
+    monkeypatch.setattr(dashboard, 'get_ratios', _failing(ratio_calls))
+    monkeypatch.setattr(dashboard, 'get_financial_history', _failing(history_calls))
+    for _ in range(3):
+        assert dashboard._ratios('AAA') is None
+        assert dashboard._financial_rows('AAA') == []
+    assert ratio_calls == ['AAA'] and history_calls == ['AAA']
+
+    # Once the failure expires the next request retries upstream
+    caches['ratio_failures'].set('AAA', 'upstream down', computed_at=time.time() - 120)
+    dashboard._ratios('AAA')
+    assert ratio_calls == ['AAA', 'AAA']
+
+
+def test_cached_failure_counts_as_cached(caches, monkeypatch):
+    monkeypatch.setattr(dashboard, 'get_ratios', _failing([]))
+    monkeypatch.setattr(dashboard, 'get_financial_history', lambda ticker: [])
+    caches['score_cache'].set('AAA', {})
+    assert not dashboard.is_cached('AAA')
+    dashboard._ratios('AAA')
+    caches['history_cache'].set('AAA', [])
+    assert dashboard.is_cached('AAA')
+
+
+def test_fresh_values_win_over_a_recorded_failure(caches, monkeypatch):
+    monkeypatch.setattr(dashboard, 'get_ratios', lambda ticker: {'Current Ratio': '1.23456'})
+    caches['ratio_failures'].set('AAA', 'upstream down')
+    caches['ratio_cache'].set('AAA', {})
+    assert dashboard._ratios('AAA')['current_ratio'] == 1.2346
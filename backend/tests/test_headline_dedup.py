@@ -0,0 +1,66 @@
+from headline_dedup import HeadlineDeduper, normalize_headline
+
+
+def _scorer(calls):
+    def score(titles):
+        calls.append(list(titles))
+        return [len(t) for t in titles]
+    return score
+
+
+def test_normalize_strips_outlet_accents_and_punctuation():
+    assert normalize_headline("Apple's Q3 Results Beat Estimates - Reuters") == "apple s q3 results beat estimates"
+    assert normalize_headline("  Nestlé cuts outlook | Bloomberg ") == "nestle cuts outlook"
+
+
+def test_syndicated_variants_share_one_cluster_and_one_model_call():
+    deduper = HeadlineDeduper()
+    calls = []
+    titles = [
+        "Apple shares rise after strong iPhone sales in China beat analyst expectations - Reuters",
+        "Apple shares rise after strong iPhone sales in China beat analyst expectations - Yahoo Finance",
+        "Apple shares rise after strong iPhone sales in China beat analyst expectations today - CNBC",
+    ]
+    scores, clusters = deduper.collapse(titles, _scorer(calls))
+    assert len(set(clusters)) == 1
+    assert len(calls) == 1 and len(calls[0]) == 1
+    assert scores == [scores[0]] * 3
+
+
+def test_different_stories_get_different_clusters():
+    deduper = HeadlineDeduper()
+    calls = []
+    titles = [
+        "Apple shares rise after strong iPhone sales in China",
+        "Exxon cuts capital spending as oil prices slump",
+        "Federal Reserve holds interest rates steady for third meeting",
+    ]
+    _, clusters = deduper.collapse(titles, _scorer(calls))
+    assert len(set(clusters)) == 3
+    assert sorted(calls[0]) == sorted(titles)
+
+
+def test_scores_are_reused_across_calls():
+    deduper = HeadlineDeduper()
+    calls = []
+    first, _ = deduper.collapse(["Tesla recalls vehicles over faulty seat belts - AP"], _scorer(calls))
+    second, _ = deduper.collapse(["Tesla recalls vehicles over faulty seat belts - BBC"], _scorer(calls))
+    assert len(calls) == 1
+    assert second == first
+    assert deduper.stats() == {'headlines': 2, 'clusters': 1, 'inference_calls': 1, 'inference_calls_saved': 1}
+
+
+def test_evicted_clusters_are_forgotten():
+    deduper = HeadlineDeduper(max_clusters=2)
+    titles = ["Apple beats earnings forecast", "Exxon cuts spending on oil", "Ford recalls pickup trucks"]
+    first = deduper.assign(titles)
+    # The oldest story was evicted, so it comes back as a new cluster
+    assert deduper.assign(titles[:1]) != first[:1]
+    assert deduper.stats()['clusters'] == 2
+
+
+def test_empty_batch_does_not_call_model():
+    deduper = HeadlineDeduper()
+    calls = []
+    assert deduper.collapse([], _scorer(calls)) == ([], [])
+    assert calls == []
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+
+import pandas as pd
+
+from statement_store import StatementStore
+
+
+def _records(ticker, assets, periods=('2024-03-31', '2024-06-30'), sector='Technology'):
+    columns = [pd.Timestamp(p) for p in periods]
+    balance = pd.DataFrame({p: [assets + i, 10.0 * (i + 1)] for i, p in enumerate(columns)},
+                           index=['Total Assets', 'Unscored Item'])
+    income = pd.DataFrame({p: [assets / 10 + i] for i, p in enumerate(columns)}, index=['Total Revenue'])
+    statements = {'quarterly_balance_sheet': balance, 'quarterly_financials': income}
+    return {ticker: (statements, {'marketCap': assets * 2, 'sector': sector})}
+
+
+def _append_many(root, worker, count):
+    store = StatementStore(root)
+    for i in range(count):
+        store.append(_records(f"W{worker}N{i}", 100.0 + i))
+
+
+def test_concurrent_writers_claim_unique_segments(tmp_path):
+    root = str(tmp_path)
+    workers, per_worker = 4, 5
+    procs = [multiprocessing.Process(target=_append_many, args=(root, w, per_worker)) for w in range(workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    names = sorted(os.listdir(root))
+    # Every segment landed under its own number and no temp files were left behind
+    assert names == [f"segment-{n:06d}.arrow" for n in range(1, workers * per_worker + 1)]
+    store = StatementStore(root)
+    assert len(store.tickers()) == workers * per_worker
+
+
+def test_append_skips_empty_records(tmp_path):
+    store = StatementStore(str(tmp_path))
+    assert store.append({'EMPTY': ({}, None)}) is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_latest_quarter_keeps_scored_items_of_latest_period(tmp_path):
+    store = StatementStore(str(tmp_path))
+    store.append(_records('AAA', 100.0))
+    store.append(_records('BBB', 500.0, sector='Energy'))
+
+    balance, income, info = store.latest_quarter('AAA')
+    assert balance == {'Total Assets': 101.0}
+    assert income == {'Total Revenue': 11.0}
+    assert info == {'marketCap': 200.0, 'sector': 'Technology'}
+    assert store.latest_quarter('BBB')[2]['sector'] == 'Energy'
+    assert store.latest_quarter('MISSING') == ({}, {}, {})
+
+
+def test_later_segments_win_and_invalidate_snapshot(tmp_path):
+    store = StatementStore(str(tmp_path))
+    store.append(_records('AAA', 100.0))
+    assert store.latest_quarter('AAA')[0]['Total Assets'] == 101.0
+
+    # A restated filing for the same period replaces the value
+    store.append(_records('AAA', 300.0))
+    assert store.latest_quarter('AAA')[0]['Total Assets'] == 301.0
+    statements, _ = store.load('AAA')
+    assert statements['quarterly_balance_sheet'].at['Total Assets', pd.Timestamp('2024-06-30')] == 301.0
+
+
+def test_other_process_segments_seen_after_reload(tmp_path):
+    reader = StatementStore(str(tmp_path))
+    StatementStore(str(tmp_path)).append(_records('AAA', 100.0))
+    assert 'AAA' not in reader
+    reader.reload()
+    assert 'AAA' in reader
@@ -0,0 +1,65 @@
+import threading
+
+from ticker_directory import TickerDirectory
+
+
+def make_directory():
+    directory = TickerDirectory()
+    directory.upsert_many([
+        ('AAPL', 'Apple Inc.'),
+        ('BRK-A', 'Berkshire Hathaway Inc. Class A'),
+        ('BRK-B', 'Berkshire Hathaway Inc. Class B'),
+        ('BF.B', 'Brown-Forman Corporation Class B'),
+        ('MSFT', 'Microsoft Corporation'),
+    ])
+    return directory
+
+
+def tickers(results):
+    return [r['ticker'] for r in results]
+
+
+def test_punctuated_tickers_match_exactly():
+    directory = make_directory()
+    for query, expected in (('BRK-B', 'BRK-B'), ('brk-a', 'BRK-A'), (' BF.B ', 'BF.B')):
+        first = directory.search(query)[0]
+        assert (first['ticker'], first['match']) == (expected, 'exact')
+
+
+def test_punctuated_prefix_matches_ticker_keys():
+    assert tickers(make_directory().search('bf.')) == ['BF.B']
+
+
+def test_ticker_prefix_ranks_before_name_words():
+    results = make_directory().search('A')
+    # AAPL is the only ticker starting with A; "Class A" is not indexed as a word
+    assert tickers(results)[0] == 'AAPL'
+    assert all(r['match'] != 'prefix' or r['ticker'] == 'AAPL' for r in results)
+
+
+def test_name_word_prefix():
+    assert set(tickers(make_directory().search('berk'))[:2]) == {'BRK-A', 'BRK-B'}
+
+
+def test_small_upserts_during_search():
+    directory = make_directory()
+    errors = []
+
+    def upsert():
+        for i in range(300):
+            directory.upsert_many([(f'T{i:03d}', f'Test Company {i}')])
+
+    def search():
+        try:
+            for _ in range(300):
+                directory.search('test comp')
+        except Exception as e:  # pragma: no cover - the failure being guarded against
+            errors.append(e)
+
+    threads = [threading.Thread(target=upsert), threading.Thread(target=search)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert directory.search('T299')[0]['ticker'] == 'T299'
@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+
+import universe
+from cache import score_cache
+from universe import UniverseIndex, _group_percentiles, _percentiles, build_universe
+
+
+def test_percentiles_without_ties_are_mid_rank():
+    assert np.allclose(_percentiles(np.array([3.0, 1.0, 2.0, 4.0])), [62.5, 12.5, 37.5, 87.5])
+
+
+def test_tied_values_share_their_average_rank():
+    pct = _percentiles(np.array([1.0, 2.0, 2.0, 3.0]))
+    assert np.allclose(pct, [12.5, 50.0, 50.0, 87.5])
+    assert np.allclose(_percentiles(np.full(5, 7.0)), 50.0)
+
+
+def test_group_percentiles_rank_within_each_group():
+    values = np.array([1.0, 1.0, 5.0, 2.0, 2.0, 2.0, 9.0])
+    groups = np.array([0, 0, 0, 1, 1, 1, 2])
+    pct = _group_percentiles(values, groups)
+    assert np.allclose(pct, [100 / 3, 100 / 3, 250 / 3, 50.0, 50.0, 50.0, 50.0])
+
+
+def test_empty_inputs():
+    assert len(_percentiles(np.array([]))) == 0
+    assert len(UniverseIndex([], [], np.empty((0, 3)))) == 0
+
+
+def test_index_orders_and_sector_filter():
+    components = np.array([[5.0, -2.0, 0.5], [1.0, 1.0, 0.5], [3.0, 0.0, 0.5]])
+    index = UniverseIndex(['A', 'B', 'C'], ['Tech', 'Tech', 'Energy'], components)
+    assert [r['ticker'] for r in index.top(3)] == ['A', 'C', 'B']
+    assert [r['ticker'] for r in index.bottom(1)] == ['B']
+    assert [r['ticker'] for r in index.top(5, 'Tech')] == ['A', 'B']
+    assert index.top(1)[0]['rank'] == 1
+
+
+def test_movers_against_previous_index():
+    previous = UniverseIndex(['A', 'B'], ['Tech', 'Tech'], np.array([[5.0, -2.0, 0.5], [1.0, 1.0, 0.5]]))
+    current = UniverseIndex(['A', 'B', 'C'], ['Tech'] * 3,
+                            np.array([[0.0, 2.0, 0.5], [6.0, -3.0, 0.5], [3.0, 0.0, 0.5]]), previous)
+    movers = current.movers(5)
+    # C is new, so it has no change and is not a mover
+    assert {r['ticker'] for r in movers} == {'A', 'B'}
+    assert all(r['change'] is not None for r in movers)
+
+
+def test_members_survive_score_expiry(monkeypatch):
+    monkeypatch.setattr(score_cache, '_entries', {})
+    score = {'sector': 'Tech', 'components': {'altman_z': 3.0, 'ohlson_o': -1.0, 'sentiment': 0.6}}
+    score_cache.set('AAA', score)
+    first = build_universe()
+    assert list(first.tickers) == ['AAA']
+
+    # Expired cache entry: the member keeps its last components
+    score_cache.set('AAA', score, computed_at=time.time() - 2 * score_cache.ttl)
+    second = build_universe(previous=first)
+    assert list(second.tickers) == ['AAA']
+    assert np.allclose(second.components, first.components)
+
+
+def test_refresh_universe_rescores_members(monkeypatch):
+    requested = []
+    monkeypatch.setattr(universe, 'get_credit_scores', lambda tickers: requested.append(list(tickers)) or {})
+    monkeypatch.setattr(universe, '_current', UniverseIndex(['AAA'], ['Tech'], np.array([[3.0, -1.0, 0.6]])))
+    monkeypatch.setattr(score_cache, '_entries', {})
+    index = universe.refresh_universe(['BBB'])
+    assert requested == [['AAA', 'BBB']]
+    assert list(index.tickers) == ['AAA']
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+import warmup
+from cache import TTLCache
+from warmup import Warmup
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake cache layer: tickers in `failing` cannot be scored; every fetch is recorded."""
+    state = {'failing': set(), 'calls': []}
+    ratios, history = TTLCache(1000), TTLCache(1000)
+
+    def scores(tickers):
+        state['calls'].append(('score', tuple(tickers)))
+        return {t: {'base_score': 50.0} for t in tickers if t not in state['failing']}
+
+    def fetcher(name, cache):
+        def fetch(ticker, refresh=False):
+            if refresh or cache.get(ticker) is None:
+                state['calls'].append((name, ticker))
+                cache.set(ticker, {})
+            return {}
+        return fetch
+
+    monkeypatch.setattr(warmup, 'get_credit_scores', scores)
+    monkeypatch.setattr(warmup, 'refresh_credit_scores', scores)
+    monkeypatch.setattr(warmup, 'get_ratios', fetcher('ratios', ratios))
+    monkeypatch.setattr(warmup, 'get_financial_history', fetcher('history', history))
+    monkeypatch.setattr(warmup, 'ratio_cache', ratios)
+    monkeypatch.setattr(warmup, 'history_cache', history)
+    state['ratios'] = ratios
+    return state
+
+
+def _fetches(state, name):
+    return [call[1] for call in state['calls'] if call[0] == name]
+
+
+def test_failed_score_skips_ratios_and_history(upstream):
+    upstream['failing'].add('BAD')
+    w = Warmup(['OK', 'BAD'], rate=0, refresh_interval=None)
+    w._pass(refresh=False)
+    assert _fetches(upstream, 'ratios') == ['OK']
+    assert _fetches(upstream, 'history') == ['OK']
+    assert w.warmed == {'OK'} and w.failed == {'BAD'}
+
+
+def test_refresh_pass_keeps_fresh_ratios(upstream):
+    w = Warmup(['AAA'], rate=0, refresh_interval=100)
+    w._pass(refresh=False)
+    w._pass(refresh=True)
+    assert len(_fetches(upstream, 'score')) == 2
+    assert _fetches(upstream, 'ratios') == ['AAA']
+
+    # Close to expiry, the next refresh pass refetches them
+    upstream['ratios'].set('AAA', {}, computed_at=time.time() - 950)
+    w._pass(refresh=True)
+    assert _fetches(upstream, 'ratios') == ['AAA', 'AAA']
+    assert _fetches(upstream, 'history') == ['AAA']
+
+
+def test_ready_needs_the_configured_fraction(upstream):
+    upstream['failing'].update({'C', 'D'})
+    w = Warmup(['A', 'B', 'C', 'D'], rate=0, refresh_interval=None, ready_fraction=0.75)
+    assert w.ready_count == 3
+    w._pass(refresh=False)
+    assert not w.ready
+    assert w.progress()['ready_count'] == 3
+
+    upstream['failing'].discard('C')
+    w._pass(refresh=False)
+    assert w.ready
+    assert w.warmed == {'A', 'B', 'C'} and w.failed == {'D'}
+
+
+def test_any_fraction_needs_one_ticker_and_empty_is_ready(upstream):
+    assert Warmup(['A', 'B'], ready_fraction=0.0).ready_count == 1
+    empty = Warmup([], refresh_interval=None)
+    empty.start()
+    assert empty.ready
+
+
+def test_concurrent_starts_create_one_warmup(upstream, monkeypatch):
+    monkeypatch.setattr(warmup, 'warmup', None)
+    created = []
+    original_start = Warmup.start
+
+    def slow_start(self):
+        created.append(self)
+        time.sleep(0.05)
+        original_start(self)
+
+    monkeypatch.setattr(Warmup, 'start', slow_start)
+    threads = [threading.Thread(target=warmup.start_warmup, args=(None,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
@@ -0,0 +1,226 @@
+"""
+Local ticker / company-name directory with prefix and fuzzy search.
+
+Names are bulk-loaded from a delimited file (ticker and name columns; the
+NASDAQ symbol-directory pipe format works as-is) and can be refreshed in
+batches. Lookups by ticker are a dict access; typeahead search uses a sorted
+key list (bisect for prefixes) and a character-trigram index for fuzzy
+matches, so no request ever goes upstream. Tickers and name words are kept
+in separate key lists so ticker-prefix hits always rank ahead of name-word
+hits.
+"""
+import bisect
+import csv
+import difflib
+import logging
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICKER_FILE = os.environ.get(
+    "CREDTECH_TICKER_FILE", os.path.join(os.path.dirname(__file__), "data", "tickers.csv")
+)
+TICKER_COLUMNS = ("ticker", "symbol", "act symbol")
+NAME_COLUMNS = ("name", "company", "company name", "security name", "longname")
+# Words that add nothing to name matching
+_STOPWORDS = {"inc", "corp", "corporation", "co", "ltd", "plc", "the", "company", "holdings", "group", "class", "common", "stock"}
+# Shorter name words ("A" in "Class A") are not indexed
+MIN_WORD_LENGTH = 2
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9 ]", " ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def read_tickers(path: str) -> List[str]:
+    """Tickers from a one-per-line file or a delimited file with a ticker column, deduplicated in order."""
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    if not lines:
+        return []
+    delimiter = max(",|\t", key=lines[0].count)
+    columns = [c.strip().lower() for c in lines[0].split(delimiter)]
+    column = next((columns.index(c) for c in TICKER_COLUMNS if c in columns), None)
+    rows = csv.reader(lines[1:] if column is not None else lines, delimiter=delimiter)
+    tickers = (r[column or 0].strip().upper() for r in rows if len(r) > (column or 0))
+    return list(dict.fromkeys(t for t in tickers if t))
+
+
+class TickerDirectory:
+    """In-memory ticker -> company name index with prefix and fuzzy search."""
+
+    def __init__(self):
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Sorted (key, ticker) pairs for tickers and for each significant name word
+        self._ticker_keys: List[Tuple[str, str]] = []
+        self._word_keys: List[Tuple[str, str]] = []
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    def upsert_many(self, rows: Iterable[Tuple[str, str]]) -> int:
+        """
+        Add or replace (ticker, name) pairs as one batch. Large batches rebuild
+        the search index once; small ones update it in place.
+        """
+        batch = {}
+        for ticker, name in rows:
+            ticker = (ticker or "").strip().upper()
+            name = (name or "").strip()
+            if ticker and name:
+                batch[ticker] = name
+        with self._lock:
+            if len(batch) > max(len(self._names) // 10, 100):
+                self._names.update(batch)
+                self._rebuild()
+            else:
+                for ticker, name in batch.items():
+                    if self._names.get(ticker) != name:
+                        self._index(ticker, remove=True)
+                        self._names[ticker] = name
+                        self._index(ticker)
+        return len(batch)
+
+    def load_file(self, path: str) -> int:
+        """Bulk-load a comma, pipe or tab delimited file with a header row."""
+        with open(path, newline="", encoding="utf-8") as f:
+            header = f.readline()
+            delimiter = max(",|\t", key=header.count)
+            columns = [c.strip().lower() for c in header.split(delimiter)]
+            ticker_col = next((columns.index(c) for c in TICKER_COLUMNS if c in columns), 0)
+            name_col = next((columns.index(c) for c in NAME_COLUMNS if c in columns), 1)
+            rows = ((r[ticker_col], r[name_col]) for r in csv.reader(f, delimiter=delimiter)
+                    if len(r) > max(ticker_col, name_col))
+            count = self.upsert_many(rows)
+        logger.info(f"Loaded {count} tickers from {path}")
+        return count
+
+    def _entries(self, ticker: str) -> Tuple[Tuple[str, str], List[Tuple[str, str]], Set[str]]:
+        """Ticker key, name-word keys and trigrams for one directory entry."""
+        words = [w for w in _normalize(self._names[ticker]).split()
+                 if w not in _STOPWORDS and len(w) >= MIN_WORD_LENGTH]
+        # The ticker key is not normalized, so punctuated tickers stay searchable as typed
+        return ((ticker.lower(), ticker), [(w, ticker) for w in words],
+                _trigrams(ticker.lower()) | _trigrams(" ".join(words)))
+
+    def _index(self, ticker: str, remove: bool = False) -> None:
+        if ticker not in self._names:
+            return
+        ticker_key, word_keys, grams = self._entries(ticker)
+        for keys, key in [(self._ticker_keys, ticker_key)] + [(self._word_keys, k) for k in word_keys]:
+            i = bisect.bisect_left(keys, key)
+            if remove:
+                if i < len(keys) and keys[i] == key:
+                    del keys[i]
+            else:
+                keys.insert(i, key)
+        for gram in grams:
+            if remove:
+                self._trigram_index[gram].discard(ticker)
+            else:
+                self._trigram_index[gram].add(ticker)
+
+    def _rebuild(self) -> None:
+        ticker_keys, word_keys, trigrams = [], [], defaultdict(set)
+        for ticker in self._names:
+            ticker_key, words, grams = self._entries(ticker)
+            ticker_keys.append(ticker_key)
+            word_keys.extend(words)
+            for gram in grams:
+                trigrams[gram].add(ticker)
+        ticker_keys.sort()
+        word_keys.sort()
+        self._ticker_keys, self._word_keys, self._trigram_index = ticker_keys, word_keys, trigrams
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._names
+
+    def name(self, ticker: str) -> Optional[str]:
+        return self._names.get(ticker.upper())
+
+    def _prefix(self, prefix: str, limit: int) -> List[str]:
+        """Tickers whose ticker starts with `prefix`, then those with a name word that does."""
+        found: List[str] = []
+        for keys in (self._ticker_keys, self._word_keys):
+            i = bisect.bisect_left(keys, (prefix, ""))
+            while i < len(keys) and len(found) < limit:
+                key, ticker = keys[i]
+                if not key.startswith(prefix):
+                    break
+                if ticker not in found:
+                    found.append(ticker)
+                i += 1
+        return found
+
+    def _fuzzy(self, query: str, limit: int, exclude: Set[str]) -> List[str]:
+        grams = _trigrams(query)
+        overlap = Counter(t for g in grams for t in self._trigram_index.get(g, ()) if t not in exclude)
+        # Shortlist by trigram overlap, then rank by edit similarity
+        shortlist = [t for t, _ in overlap.most_common(limit * 5)]
+        scored = []
+        for ticker in shortlist:
+            target = _normalize(self._names[ticker])
+            score = max(difflib.SequenceMatcher(None, query, target).ratio(),
+                        difflib.SequenceMatcher(None, query, ticker.lower()).ratio())
+            scored.append((score, ticker))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [t for score, t in scored[:limit] if score >= 0.4]
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Prefix matches on ticker and name words first, then fuzzy matches."""
+        # Small upserts edit the key lists and trigram sets in place
+        with self._lock:
+            return self._search(query, limit)
+
+    def _search(self, query: str, limit: int) -> List[dict]:
+        # Tickers keep their punctuation (BRK-B, BF.B), so match them before normalizing
+        raw = query.strip().lower()
+        query = _normalize(query)
+        if not raw:
+            return []
+        # Exact ticker first, then prefix hits on the whole query or its last word
+        exact = [raw.upper()] if raw.upper() in self._names else []
+        prefix = self._prefix(raw, limit + 1) if raw != query else []
+        if " " in query:
+            # Multi-word query: prefix on the last word, filtered to names containing the rest
+            head, last = query.rsplit(" ", 1)
+            prefix += [t for t in self._prefix(last, limit * 20) if head in _normalize(self._names[t])]
+        elif query:
+            prefix += self._prefix(query, limit + 1)
+        prefix = [t for t in dict.fromkeys(prefix) if t not in exact]
+        results = [{"ticker": t, "name": self._names[t], "match": "exact"} for t in exact]
+        results += [{"ticker": t, "name": self._names[t], "match": "prefix"} for t in prefix]
+        results = results[:limit]
+        if len(results) < limit and query:
+            seen = {r["ticker"] for r in results}
+            results += [{"ticker": t, "name": self._names[t], "match": "fuzzy"}
+                        for t in self._fuzzy(query, limit - len(results), seen)]
+        return results
+
+
+directory = TickerDirectory()
+
+
+def load_default_directory() -> int:
+    """Load the bundled (or CREDTECH_TICKER_FILE) directory file if it exists"""
+    if os.path.exists(DEFAULT_TICKER_FILE):
+        return directory.load_file(DEFAULT_TICKER_FILE)
+    logger.warning(f"Ticker file not found: {DEFAULT_TICKER_FILE}")
+    return 0
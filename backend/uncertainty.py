@@ -0,0 +1,179 @@
+"""
+Monte Carlo uncertainty bands for the credit score.
+
+Each issuer's inputs are perturbed thousands of times and the final score is
+recomputed for every draw; the band is a pair of percentiles of the resulting
+score distribution. Fields filled in by a fallback (the 40%/60% current
+asset/liability estimates, the net-income EBIT proxy, defaults) get much wider
+noise than reported figures, and sentiment gets the sampling error of the
+headline average. All issuers and draws are evaluated as (issuers x draws)
+NumPy arrays, in chunks that bound memory, so a whole universe is one pass.
+
+Every issuer is evaluated against the same standard-normal draws (common
+random numbers, one seeded generator per call), scaled by its own noise.
+Identical inputs therefore always give the same band, whichever batch the
+issuer was scored in, so a recompute of an unchanged score reproduces its
+band and keeps its ETag.
+"""
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from credtech import altman_z_score, ohlson_o_score, normalize_scores
+
+# Fields perturbed independently; working_capital is derived from the current
+# asset/liability draws so the three stay consistent.
+PERTURBED_FIELDS = [
+    'total_assets', 'total_liabilities', 'retained_earnings', 'ebit',
+    'market_value_equity', 'sales', 'net_income', 'current_assets', 'current_liabilities',
+]
+POSITIVE_FIELDS = {
+    'total_assets', 'total_liabilities', 'market_value_equity', 'sales',
+    'current_assets', 'current_liabilities',
+}
+
+# Relative standard deviation of the noise on reported statement values
+REPORTED_NOISE = 0.02
+# Relative standard deviation for fields that came from a fallback estimate
+ESTIMATED_NOISE = {
+    'current_assets': 0.30,       # 40% of total assets
+    'current_liabilities': 0.30,  # 60% of total liabilities
+    'ebit': 0.35,                 # net income used as EBIT proxy
+}
+DEFAULT_ESTIMATED_NOISE = 0.25
+# Noise is scaled by max(|value|, SCALE_FLOOR * total_assets) so fields
+# defaulted to 0 still get a meaningful spread
+SCALE_FLOOR = 0.01
+# Standard error assumed for sentiment when fewer than 2 headlines were scored
+DEFAULT_SENTIMENT_SE = 0.15
+
+# Draws are float32: ample precision for percentile bands at half the memory
+# traffic of float64. Cap on issuers x draws per chunk (~4 MB per array).
+DRAW_DTYPE = np.float32
+MAX_CHUNK_ELEMENTS = 1_000_000
+
+
+def _sentiment_se(counts: np.ndarray, stds: np.ndarray) -> np.ndarray:
+    se = np.full(len(counts), DEFAULT_SENTIMENT_SE)
+    enough = counts >= 2
+    se[enough] = stds[enough] / np.sqrt(counts[enough])
+    return se
+
+
+def score_band_arrays(
+    columns: Dict[str, np.ndarray],
+    estimated: Optional[Dict[str, np.ndarray]] = None,
+    sentiment_se: Optional[np.ndarray] = None,
+    *,
+    weights: Tuple[float, float, float],
+    altman_range: Tuple[float, float],
+    ohlson_range: Tuple[float, float],
+    n_draws: int = 2000,
+    percentiles: Sequence[float] = (5, 95),
+    seed: int = 0,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Percentile score bands for a batch of issuers held as column arrays.
+
+    Args:
+        columns: CompanyFinancials field name -> (n_issuers,) array
+        estimated: Field name -> (n_issuers,) bool mask of fallback-estimated values
+        sentiment_se: (n_issuers,) standard error of each sentiment score
+        weights: (altman, ohlson, sentiment) weights of the final score
+        altman_range, ohlson_range: Normalization ranges for the raw scores
+        n_draws: Monte Carlo draws per issuer
+        percentiles: Percentiles of the score distribution to return
+        seed: Seed of the standard-normal draws shared by all issuers
+
+    Returns:
+        One (n_issuers,) array per requested percentile
+    """
+    estimated = estimated or {}
+    base = {name: np.asarray(columns[name], dtype=DRAW_DTYPE) for name in PERTURBED_FIELDS + ['working_capital', 'sentiment_score']}
+    n = len(base['total_assets'])
+    if sentiment_se is None:
+        sentiment_se = np.full(n, DEFAULT_SENTIMENT_SE)
+    sentiment_se = np.asarray(sentiment_se, dtype=DRAW_DTYPE)
+
+    # Per-issuer noise scale for every field, shape (n,)
+    floor = SCALE_FLOOR * np.abs(base['total_assets'])
+    scales = {}
+    for name in PERTURBED_FIELDS + ['working_capital']:
+        mask = np.asarray(estimated.get(name, np.zeros(n, dtype=bool)), dtype=bool)
+        rel = np.where(mask, ESTIMATED_NOISE.get(name, DEFAULT_ESTIMATED_NOISE), REPORTED_NOISE)
+        scales[name] = (rel * np.maximum(np.abs(base[name]), floor)).astype(DRAW_DTYPE)
+    # Working capital only gets its own noise when it was defaulted; otherwise
+    # it moves with the current asset/liability draws
+    wc_mask = np.asarray(estimated.get('working_capital', np.zeros(n, dtype=bool)), dtype=bool)
+    scales['working_capital'] = np.where(wc_mask, scales['working_capital'], DRAW_DTYPE(0))
+
+    w_altman, w_ohlson, w_sentiment = weights
+    noise_fields = PERTURBED_FIELDS + ['working_capital', 'sentiment_score']
+    # (fields, draws) standard normals shared by every issuer, broadcast over the issuer axis
+    shared = np.random.default_rng(seed).standard_normal((len(noise_fields), n_draws), dtype=DRAW_DTYPE)
+    z = {name: shared[f][None, :] for f, name in enumerate(noise_fields)}
+    out = [np.empty(n) for _ in percentiles]
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(n_draws, 1))
+
+    for lo in range(0, n, chunk):
+        hi = min(n, lo + chunk)
+        draws = {}
+        for name in PERTURBED_FIELDS:
+            value = base[name][lo:hi, None] + scales[name][lo:hi, None] * z[name]
+            if name in POSITIVE_FIELDS:
+                value = np.maximum(value, DRAW_DTYPE(1))
+            draws[name] = value
+        draws['working_capital'] = (
+            base['working_capital'][lo:hi, None]
+            + (draws['current_assets'] - base['current_assets'][lo:hi, None])
+            - (draws['current_liabilities'] - base['current_liabilities'][lo:hi, None])
+            + scales['working_capital'][lo:hi, None] * z['working_capital']
+        )
+        sentiment = np.clip(
+            base['sentiment_score'][lo:hi, None] + sentiment_se[lo:hi, None] * z['sentiment_score'], 0, 1
+        )
+
+        fin = SimpleNamespace(**draws)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            scores = (
+                w_altman * normalize_scores(altman_z_score(fin), *altman_range)
+                + w_ohlson * normalize_scores(ohlson_o_score(fin), *ohlson_range)
+                + w_sentiment * sentiment * 100
+            )
+        scores = np.nan_to_num(scores, nan=0.0)
+        bands = np.percentile(scores, percentiles, axis=1)
+        for i in range(len(percentiles)):
+            out[i][lo:hi] = bands[i]
+    return tuple(out)
+
+
+def score_bands(
+    fins: List,
+    estimated: Optional[Iterable[Set[str]]] = None,
+    sentiment_counts: Optional[Iterable[int]] = None,
+    sentiment_stds: Optional[Iterable[float]] = None,
+    **kwargs,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Percentile score bands for a list of CompanyFinancials-like objects.
+
+    `estimated` holds, per issuer, the names of fields that came from a
+    fallback; `sentiment_counts` / `sentiment_stds` describe the headlines
+    behind each sentiment score. Remaining keyword arguments, which must
+    include weights, altman_range and ohlson_range, are passed to
+    score_band_arrays.
+    """
+    names = PERTURBED_FIELDS + ['working_capital', 'sentiment_score']
+    columns = {name: np.array([getattr(fin, name) for fin in fins], dtype=float) for name in names}
+
+    masks = None
+    if estimated is not None:
+        estimated = list(estimated)
+        masks = {name: np.array([name in est for est in estimated], dtype=bool) for name in names}
+
+    se = None
+    if sentiment_counts is not None and sentiment_stds is not None:
+        se = _sentiment_se(np.array(list(sentiment_counts), dtype=float), np.array(list(sentiment_stds), dtype=float))
+
+    return score_band_arrays(columns, masks, se, **kwargs)
@@ -0,0 +1,239 @@
+"""
+Universe-wide ranking with cross-sectional percentile normalization.
+
+Instead of mapping raw Altman Z / Ohlson O onto fixed ranges, universe mode
+ranks each issuer against everyone else in the universe (and against its
+sector bucket). Each refresh builds an immutable UniverseIndex whose sort
+orders are computed once, so top-k, bottom-k and "biggest movers" queries are
+array slices rather than a sort per request.
+
+Membership belongs to the index, not to the score cache: a refresh re-scores
+every member (plus any tickers asked for) in a background thread and merges
+in whatever else is cached, and a member whose score could not be refreshed
+keeps its last components rather than dropping out when its cache entry
+expires.
+"""
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from cache import score_cache, get_credit_scores
+from fetch_and_score import SCORE_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+
+def _percentiles(values: np.ndarray) -> np.ndarray:
+    """Mid-rank percentile (0-100) of each value within the array; ties share their average rank."""
+    return _group_percentiles(values, np.zeros(len(values), dtype=int))
+
+
+def _group_percentiles(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Mid-rank percentile of each value within its group (groups are int codes); ties share their average rank."""
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+    order = np.lexsort((values, groups))
+    sorted_values, sorted_groups = values[order], groups[order]
+    # Runs of equal (group, value) pairs in sorted order; each run spans positions [start, end)
+    new_run = np.r_[True, (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_values[1:] != sorted_values[:-1])]
+    starts = np.flatnonzero(new_run)
+    ends = np.r_[starts[1:], n]
+    run = np.cumsum(new_run) - 1
+    # Average position within the group = average index in the run - first index of the group
+    position = (starts[run] + ends[run] - 1) / 2 - np.searchsorted(sorted_groups, sorted_groups, side='left')
+    sizes = np.bincount(groups)[sorted_groups]
+    pct = np.empty(n)
+    pct[order] = (position + 0.5) / sizes * 100
+    return pct
+
+
+class UniverseIndex:
+    """Cross-sectional snapshot of the scored universe with precomputed sort orders."""
+
+    def __init__(self, tickers: List[str], sectors: List[str], components: np.ndarray,
+                 previous: Optional['UniverseIndex'] = None, weights=SCORE_WEIGHTS):
+        self.tickers = np.array(tickers, dtype=object)
+        self.sectors = np.array(sectors, dtype=object)
+        self.components = components
+        self.altman, self.ohlson, self.sentiment = (components[:, i] for i in range(3))
+        n = len(tickers)
+
+        self.sector_names, codes = np.unique(self.sectors.astype(str), return_inverse=True) if n else (np.array([]), np.array([], dtype=int))
+        self.altman_pct = _percentiles(self.altman)
+        self.ohlson_pct = _percentiles(self.ohlson)
+        self.sector_altman_pct = _group_percentiles(self.altman, codes)
+        self.sector_ohlson_pct = _group_percentiles(self.ohlson, codes)
+
+        w_altman, w_ohlson, w_sentiment = weights
+        self.score = w_altman * self.altman_pct + w_ohlson * self.ohlson_pct + w_sentiment * self.sentiment * 100
+        self.percentile = _percentiles(self.score)
+        self.sector_percentile = _group_percentiles(self.score, codes)
+
+        # Best-first orders: global, and per sector as slices of one lexsort
+        self.order = np.argsort(-self.score, kind='stable')
+        self.rank = np.empty(n, dtype=int)
+        self.rank[self.order] = np.arange(1, n + 1)
+        by_sector = np.lexsort((-self.score, codes))
+        bounds = np.searchsorted(codes[by_sector], np.arange(len(self.sector_names) + 1))
+        self.sector_orders: Dict[str, np.ndarray] = {
+            name: by_sector[bounds[i]:bounds[i + 1]] for i, name in enumerate(self.sector_names)
+        }
+
+        # Score change against the previous refresh, largest absolute move first
+        self.delta = np.full(n, np.nan)
+        if previous is not None:
+            prev_score = dict(zip(previous.tickers, previous.score))
+            self.delta = np.array([self.score[i] - prev_score.get(t, np.nan) for i, t in enumerate(self.tickers)])
+        moved = np.flatnonzero(~np.isnan(self.delta))
+        self.movers_order = moved[np.argsort(-np.abs(self.delta[moved]), kind='stable')]
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def _rows(self, idx: np.ndarray) -> List[dict]:
+        return [{
+            'ticker': self.tickers[i],
+            'sector': self.sectors[i],
+            'universe_score': round(float(self.score[i]), 2),
+            'rank': int(self.rank[i]),
+            'percentile': round(float(self.percentile[i]), 2),
+            'sector_percentile': round(float(self.sector_percentile[i]), 2),
+            'altman_percentile': round(float(self.altman_pct[i]), 2),
+            'ohlson_percentile': round(float(self.ohlson_pct[i]), 2),
+            'change': None if np.isnan(self.delta[i]) else round(float(self.delta[i]), 2),
+        } for i in idx]
+
+    def _ordered(self, sector: Optional[str]) -> np.ndarray:
+        if sector is None:
+            return self.order
+        return self.sector_orders.get(sector, np.array([], dtype=int))
+
+    def top(self, k: int, sector: Optional[str] = None) -> List[dict]:
+        return self._rows(self._ordered(sector)[:k])
+
+    def bottom(self, k: int, sector: Optional[str] = None) -> List[dict]:
+        order = self._ordered(sector)
+        return self._rows(order[::-1][:k])
+
+    def movers(self, k: int, sector: Optional[str] = None) -> List[dict]:
+        order = self.movers_order
+        if sector is not None:
+            order = order[self.sectors[order] == sector]
+        return self._rows(order[:k])
+
+
+_lock = threading.Lock()
+_current: Optional[UniverseIndex] = None
+# Tickers waiting for the background refresh, and whether one is running
+_queue_lock = threading.Lock()
+_pending: Set[str] = set()
+_refreshing = False
+
+
+def build_universe(previous: Optional[UniverseIndex] = None) -> UniverseIndex:
+    """
+    Build an index over the members of `previous` plus every ticker with fresh
+    cached components. Fresh components replace a member's old ones; members
+    without a fresh score keep the components they had.
+    """
+    members: Dict[str, tuple] = {}
+    if previous is not None:
+        for ticker, sector, row in zip(previous.tickers, previous.sectors, previous.components):
+            members[ticker] = (sector, tuple(row))
+    for ticker, score, _ in score_cache.items():
+        if 'components' not in score:
+            continue
+        c = score['components']
+        members[ticker] = (score.get('sector') or 'Unknown', (c['altman_z'], c['ohlson_o'], c['sentiment']))
+    tickers = list(members)
+    sectors = [members[t][0] for t in tickers]
+    rows = [members[t][1] for t in tickers]
+    return UniverseIndex(tickers, sectors, np.array(rows, dtype=float).reshape(-1, 3), previous)
+
+
+def refresh_universe(tickers: Optional[Iterable[str]] = None) -> UniverseIndex:
+    """
+    Re-score the current members and any requested tickers (cached scores are
+    reused), then rebuild the index. The index it replaces becomes the
+    baseline for the movers query.
+    """
+    global _current
+    members = set(_current.tickers) if _current is not None else set()
+    members.update(tickers or ())
+    if members:
+        get_credit_scores(sorted(members))
+    with _lock:
+        _current = build_universe(previous=_current)
+        logger.info(f"Universe refreshed with {len(_current)} issuers")
+        return _current
+
+
+def _refresh_worker() -> None:
+    global _refreshing
+    while True:
+        with _queue_lock:
+            tickers = sorted(_pending)
+            _pending.clear()
+        try:
+            refresh_universe(tickers)
+        except Exception as e:
+            logger.error(f"Universe refresh failed: {str(e)}")
+        with _queue_lock:
+            if not _pending:
+                _refreshing = False
+                return
+
+
+def schedule_refresh(tickers: Optional[Iterable[str]] = None) -> bool:
+    """
+    Refresh the universe in a background thread. Tickers requested while a
+    refresh is running are picked up by another pass of the same thread.
+    Returns whether a new refresh thread was started.
+    """
+    global _refreshing
+    with _queue_lock:
+        _pending.update(tickers or ())
+        if _refreshing:
+            return False
+        _refreshing = True
+    threading.Thread(target=_refresh_worker, name="universe-refresh", daemon=True).start()
+    return True
+
+
+def refresh_status() -> dict:
+    """Whether a background refresh is running and how many tickers are queued for it"""
+    with _queue_lock:
+        return {'refreshing': _refreshing, 'queued': len(_pending)}
+
+
+def current_universe() -> UniverseIndex:
+    """The latest index, built on first use"""
+    if _current is None:
+        return refresh_universe()
+    return _current
+
+
+def universe_query_payload(kind: str, k: int, sector: Optional[str] = None) -> dict:
+    """Answer a top / bottom / movers query from the current index"""
+    index = current_universe()
+    rows = getattr(index, kind)(k, sector)
+    return {
+        'query': kind,
+        'sector': sector,
+        'universe_size': len(index),
+        'results': rows,
+        'success': True
+    }
+
+
+def universe_refresh_payload(tickers: Optional[List[str]] = None) -> dict:
+    """Start a background refresh; reports the size of the index still being served"""
+    schedule_refresh(tickers)
+    return {
+        'universe_size': len(_current) if _current is not None else 0,
+        **refresh_status(),
+        'success': True
+    }
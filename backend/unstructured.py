@@ -1,27 +1,63 @@
+import calendar
+import time
+
 import feedparser
+import numpy as np
 from transformers import pipeline
 
+from headline_dedup import headline_deduper
+
 sentiment_model = pipeline("text-classification",
                            model="ProsusAI/finbert")
 label_to_score = {"positive": 1, "neutral": 0.5, "negative": 0}
 
-def news_sentiment_score(ticker):
-
+def fetch_headlines(ticker):
+    """Current news headlines for a ticker as (published epoch seconds, title) pairs."""
     feed = feedparser.parse(f"https://news.google.com/rss/search?q={ticker}+stocks")
-    headlines = [entry.title for entry in feed.entries]
+    now = time.time()
+    headlines = []
+    for entry in feed.entries:
+        published = getattr(entry, "published_parsed", None)
+        headlines.append((calendar.timegm(published) if published else now, entry.title))
+    return headlines
+
+def score_headlines(headlines):
+    """
+    Run the sentiment model over headline titles.
+
+    Returns:
+        list: Scaled score in [0, 1] per headline, or None for neutral ones
+    """
+    if not headlines:
+        return []
+    results = sentiment_model(list(headlines), batch_size=128)
 
-    results = sentiment_model(headlines, batch_size=128)
-    
     scores = []
-    for h, r in zip(headlines, results):
+    for r in results:
         l=r["label"]
-        if l!="neutral":
-            scores.append((h, label_to_score[l] * r["score"]))
+        scores.append(None if l=="neutral" else (label_to_score[l] * r["score"] + 1) / 2)
+    return scores
+
+def news_sentiment_details(ticker):
+    """
+    Score the current news feed for a ticker.
+
+    Returns:
+        scaled_sentiment (float): Sentiment in [0, 1]
+        count (int): Number of distinct non-neutral stories behind it
+        std (float): Spread of the per-headline scaled scores (0 if fewer than 2)
+    """
+    headlines = [title for _, title in fetch_headlines(ticker)]
+    scores, clusters = headline_deduper.collapse(headlines, score_headlines)
+    # Syndicated variants of one story count once
+    unique = dict(zip(clusters, scores))
+    scaled = np.array([s for s in unique.values() if s is not None])
 
-    if scores:
-        daily_sentiment = sum(s for _, s in scores) / len(scores)
-    else:
-        daily_sentiment = 0.0
-    scaled_sentiment = (daily_sentiment+1)/2
+    # No opinionated headlines reads as neutral
+    scaled_sentiment = float(scaled.mean()) if len(scaled) else 0.5
+    std = float(scaled.std(ddof=1)) if len(scaled) > 1 else 0.0
 
-    return(scaled_sentiment)
\ No newline at end of file
+    return scaled_sentiment, len(scaled), std
+
+def news_sentiment_score(ticker):
+    return news_sentiment_details(ticker)[0]
@@ -0,0 +1,190 @@
+"""
+Background cache warm-up from a watchlist, with a readiness gate.
+
+At startup the tickers in CREDTECH_WATCHLIST (a ticker file, see
+ticker_directory.read_tickers) are scored (which also polls and scores their
+news sentiment) and have their ratios and financial history fetched, at
+most CREDTECH_WARMUP_RATE tickers per second on CREDTECH_WARMUP_WORKERS
+threads, so user requests find them in the cache. The service reports ready
+once CREDTECH_WARMUP_READY_FRACTION of the watchlist is warmed (an empty
+watchlist is ready at once). Later passes start a fixed interval after the
+previous pass started, so the watchlist's scores are recomputed before they
+expire as long as a pass fits in that interval; a slower pass is logged.
+Ratios and history live longer than scores and are refetched only when they
+would expire before the next pass.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from cache import (SCORE_TTL, TTLCache, get_credit_scores, get_financial_history, get_ratios, history_cache,
+                   ratio_cache, refresh_credit_scores, score_cache)
+from ticker_directory import read_tickers
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_FILE = os.environ.get("CREDTECH_WATCHLIST")
+# Upper bound on tickers started per second, and on tickers in flight
+WARMUP_RATE = float(os.environ.get("CREDTECH_WARMUP_RATE", "2"))
+WARMUP_WORKERS = int(os.environ.get("CREDTECH_WARMUP_WORKERS", "2"))
+# Share of the watchlist that must be warmed before the service reports ready
+READY_FRACTION = float(os.environ.get("CREDTECH_WARMUP_READY_FRACTION", "0.9"))
+# Re-warm before cached scores expire
+REFRESH_FRACTION = 0.8
+
+
+class Warmup:
+    """Rate-limited background pre-computation of scores, sentiment and ratios for a watchlist."""
+
+    def __init__(self, tickers: List[str], rate: float = WARMUP_RATE, workers: int = WARMUP_WORKERS,
+                 refresh_interval: Optional[float] = SCORE_TTL * REFRESH_FRACTION,
+                 ready_fraction: float = READY_FRACTION):
+        self.tickers = tickers
+        self.rate = rate
+        self.workers = max(workers, 1)
+        self.refresh_interval = refresh_interval
+        # Tickers that must be warmed to report ready; at least one of a non-empty watchlist
+        fraction = min(max(ready_fraction, 0.0), 1.0)
+        self.ready_count = max(math.ceil(fraction * len(tickers)), 1) if tickers else 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.warmed: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.passes = 0
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        if not self.tickers:
+            self.ready_at = self.started_at
+            return
+        self._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+        self._thread.start()
+        logger.info(f"Warming {len(self.tickers)} watchlist tickers at {self.rate}/s")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            pass_start = time.monotonic()
+            self._pass(refresh=self.passes > 0)
+            self.passes += 1
+            if self.ready_at is None:
+                logger.error(f"Warm-up pass {self.passes} warmed {len(self.warmed)} of {len(self.tickers)} tickers, "
+                             f"{self.ready_count} needed; not ready")
+            if not self.refresh_interval:
+                break
+            # Measured from the start of the pass, so cached scores are renewed before they expire
+            elapsed = time.monotonic() - pass_start
+            if elapsed > self.refresh_interval:
+                logger.warning(f"Warm-up pass took {elapsed:.0f}s, longer than the {self.refresh_interval:.0f}s "
+                               f"refresh interval; raise CREDTECH_WARMUP_RATE or CREDTECH_SCORE_TTL")
+            if self._stop.wait(max(self.refresh_interval - elapsed, 0.0)):
+                break
+
+    def _pass(self, refresh: bool) -> None:
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        slots = threading.Semaphore(self.workers)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warmup") as executor:
+            for ticker in self.tickers:
+                slots.acquire()
+                if self._stop.is_set():
+                    slots.release()
+                    break
+                future = executor.submit(self._warm, ticker, refresh)
+                future.add_done_callback(lambda _: slots.release())
+                if self._stop.wait(interval):
+                    break
+
+    def _expiring(self, cache: TTLCache, ticker: str) -> bool:
+        """Whether a cached entry would expire before the next pass renews it"""
+        return cache.remaining(ticker) < (self.refresh_interval or 0.0)
+
+    def _warm(self, ticker: str, refresh: bool) -> None:
+        try:
+            scores = refresh_credit_scores([ticker]) if refresh else get_credit_scores([ticker])
+            ok = ticker in scores
+            # Ratios and history of a ticker that cannot be scored are not worth fetching
+            if ok:
+                get_ratios(ticker, refresh=refresh and self._expiring(ratio_cache, ticker))
+                get_financial_history(ticker, refresh=refresh and self._expiring(history_cache, ticker))
+        except Exception as e:
+            logger.error(f"Warm-up failed for {ticker}: {str(e)}")
+            ok = False
+        with self._lock:
+            if ok:
+                # A ticker that failed earlier counts once a later pass caches it
+                self.warmed.add(ticker)
+                self.failed.discard(ticker)
+            elif ticker not in self.warmed:
+                self.failed.add(ticker)
+            if self.ready_at is None and len(self.warmed) >= self.ready_count:
+                self.ready_at = time.time()
+                logger.info(f"Warm-up ready in {self.ready_at - self.started_at:.1f}s: "
+                            f"{len(self.warmed)} of {len(self.tickers)} warmed, {len(self.failed)} failed")
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def progress(self) -> dict:
+        with self._lock:
+            warmed, failed = len(self.warmed), len(self.failed)
+            failed_tickers = sorted(self.failed)
+        total = len(self.tickers)
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        done = warmed + failed
+        eta = None
+        if not self.ready and done:
+            eta = round(elapsed / done * (total - done), 1)
+        return {
+            'ready': self.ready,
+            'total': total,
+            'ready_count': self.ready_count,
+            'warmed': warmed,
+            'failed': failed,
+            'failed_tickers': failed_tickers,
+            'cached': sum(1 for t in self.tickers if t in score_cache),
+            'progress': round(done / total, 4) if total else 1.0,
+            'passes': self.passes,
+            'elapsed_seconds': round(elapsed, 1),
+            'eta_seconds': eta,
+        }
+
+
+warmup: Optional[Warmup] = None
+# Concurrent first requests on a threaded server must not start two warm-ups
+_start_lock = threading.Lock()
+
+
+def start_warmup(path: Optional[str] = WATCHLIST_FILE) -> Warmup:
+    """Start warming the watchlist at `path` (once per process); no path means ready at once"""
+    global warmup
+    with _start_lock:
+        if warmup is None:
+            tickers = []
+            if path:
+                try:
+                    tickers = read_tickers(path)
+                except OSError as e:
+                    logger.error(f"Could not read watchlist {path}: {str(e)}")
+            warmup = Warmup(tickers)
+            warmup.start()
+    return warmup
+
+
+def readiness_payload() -> Tuple[dict, int]:
+    """Warm-up progress with 200 once the watchlist is cached, 503 before"""
+    if warmup is None:
+        return {'ready': False, 'error': 'Warm-up not started'}, 503
+    progress = warmup.progress()
+    return progress, 200 if progress['ready'] else 503
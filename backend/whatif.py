@@ -0,0 +1,107 @@
+"""
+What-if reweighting over stored score components.
+
+Final scores are a weighted sum of normalized Altman Z, Ohlson O and
+sentiment, so once the raw components are stored (cache.cached_components
+keeps the latest ones per ticker, past the score TTL) any number of weight and
+normalization-range configurations can be re-evaluated as a single
+(configs x tickers) NumPy expression, with no refetching or FinBERT runs.
+"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from cache import cached_components
+from fetch_and_score import ALTMAN_RANGE, OHLSON_RANGE, SCORE_WEIGHTS
+
+MAX_CONFIGS = 1000
+
+DEFAULT_CONFIG = {
+    'weight_altman': SCORE_WEIGHTS[0],
+    'weight_ohlson': SCORE_WEIGHTS[1],
+    'weight_sentiment': SCORE_WEIGHTS[2],
+    'altman_range': list(ALTMAN_RANGE),
+    'ohlson_range': list(OHLSON_RANGE),
+}
+
+
+def parse_configs(raw_configs) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """
+    Validate what-if configurations; missing keys take the production defaults.
+
+    Returns:
+        params (ndarray): (n_configs, 7) array of weight_altman, weight_ohlson,
+            weight_sentiment, altman_min, altman_max, ohlson_min, ohlson_max
+        error (str): Error message for a 400 response, or None if valid
+    """
+    if not isinstance(raw_configs, list) or not raw_configs:
+        return None, 'No configs provided'
+    if len(raw_configs) > MAX_CONFIGS:
+        return None, f'Maximum {MAX_CONFIGS} configs per request'
+
+    rows = []
+    for i, raw in enumerate(raw_configs):
+        if not isinstance(raw, dict):
+            return None, f'Config {i} must be an object'
+        config = {**DEFAULT_CONFIG, **raw}
+        try:
+            row = [float(config['weight_altman']), float(config['weight_ohlson']), float(config['weight_sentiment'])]
+            for key in ('altman_range', 'ohlson_range'):
+                lo, hi = (float(v) for v in config[key])
+                if hi <= lo:
+                    return None, f'Config {i}: {key} must be [min, max] with min < max'
+                row += [lo, hi]
+        except (TypeError, ValueError):
+            return None, f'Config {i} has non-numeric weights or ranges'
+        # float() accepts "nan" and "inf", which would slip past the range check
+        if not all(math.isfinite(v) for v in row):
+            return None, f'Config {i} has non-finite weights or ranges'
+        rows.append(row)
+    return np.array(rows, dtype=float), None
+
+
+def reweight_scores(components: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    Re-evaluate final scores for every config and ticker at once.
+
+    Args:
+        components: (n_tickers, 3) array of raw Altman Z, Ohlson O, sentiment
+        params: (n_configs, 7) array from parse_configs
+
+    Returns:
+        (n_configs, n_tickers) array of final scores
+    """
+    altman, ohlson, sentiment = (components[:, i][None, :] for i in range(3))
+    w_altman, w_ohlson, w_sentiment, a_lo, a_hi, o_lo, o_hi = (params[:, i][:, None] for i in range(7))
+
+    altman_norm = np.clip(100 * (altman - a_lo) / (a_hi - a_lo), 0, 100)
+    ohlson_norm = np.clip(100 * (ohlson - o_lo) / (o_hi - o_lo), 0, 100)
+    return w_altman * altman_norm + w_ohlson * ohlson_norm + w_sentiment * sentiment * 100
+
+
+def what_if_payload(data: Optional[dict]) -> Tuple[dict, int]:
+    """
+    Build the what-if response for a request body of the form
+    {"configs": [{...}, ...], "tickers": [...]}; tickers defaults to every scored one.
+    """
+    data = data or {}
+    params, error = parse_configs(data.get('configs'))
+    if error:
+        return {'error': error}, 400
+
+    tickers = data.get('tickers')
+    if tickers is not None:
+        if not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers):
+            return {'error': 'tickers must be a list of ticker strings'}, 400
+        tickers = [ticker.upper() for ticker in tickers]
+    found, components, missing = cached_components(tickers)
+
+    scores = reweight_scores(components, params)
+    return {
+        'tickers': found,
+        'scores': np.round(scores, 2).tolist(),
+        'missing': missing,
+        'config_count': len(params),
+        'success': True
+    }, 200